@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import json
 
 from sqlalchemy import (
@@ -108,7 +108,7 @@ class Employee(EmployeeBase):
 
     @property
     def role_list(self) -> List[str]:
-        return [role.strip() for role in self.roles.split(",") if role.strip()]
+        return [cleaned for role in self.roles.split(",") if (cleaned := role.strip())]
 
     @role_list.setter
     def role_list(self, roles: Iterable[str]) -> None:
@@ -1034,6 +1034,32 @@ def get_employee_role_wages(employee_session=None, employee_ids: Optional[Iterab
             employee_session.close()
 
 
+def get_employee_unavailability_windows(
+    employee_session=None, employee_ids: Optional[Iterable[int]] = None
+) -> Dict[int, Dict[int, List[Tuple[int, int]]]]:
+    """Return unavailability as ``{employee_id: {day_of_week: [(start_min, end_min), ...]}}``."""
+    employee_session, close_session = _coerce_employee_session(employee_session)
+    try:
+        stmt = select(
+            EmployeeUnavailability.employee_id,
+            EmployeeUnavailability.day_of_week,
+            EmployeeUnavailability.start_time,
+            EmployeeUnavailability.end_time,
+        )
+        ids = list(employee_ids or [])
+        if ids:
+            stmt = stmt.where(EmployeeUnavailability.employee_id.in_(ids))
+        windows: Dict[int, Dict[int, List[Tuple[int, int]]]] = {}
+        for employee_id, day_of_week, start_time, end_time in employee_session.execute(stmt):
+            windows.setdefault(employee_id, {}).setdefault(day_of_week, []).append(
+                (start_time.hour * 60 + start_time.minute, end_time.hour * 60 + end_time.minute)
+            )
+        return windows
+    finally:
+        if close_session:
+            employee_session.close()
+
+
 def save_employee_role_wages(employee_session, employee_id: int, mapping: Dict[str, float]) -> int:
     employee_session, close_session = _coerce_employee_session(employee_session)
     try:
@@ -1167,8 +1193,7 @@ def set_week_status(session, week_start_date: datetime.date, status: str) -> Wee
     return week
 
 
-def upsert_shift(session, shift: Dict[str, Any]) -> int:
-    shift_id = shift.get("id")
+def _shift_column_values(session, shift: Dict[str, Any]) -> Tuple[WeekSchedule, Dict[str, Any]]:
     start = shift.get("start")
     end = shift.get("end")
     if not isinstance(start, datetime.datetime) or not isinstance(end, datetime.datetime):
@@ -1202,29 +1227,58 @@ def upsert_shift(session, shift: Dict[str, Any]) -> int:
     if labor_cost is None:
         labor_cost = round(hours * labor_rate, 2)
 
+    return week, {
+        "week_id": week_id,
+        "employee_id": shift.get("employee_id"),
+        "role": role,
+        "start": start,
+        "end": end,
+        "location": shift.get("location", "") or "",
+        "notes": shift.get("notes", "") or "",
+        "status": (shift.get("status") or "draft").lower(),
+        "labor_rate": labor_rate,
+        "labor_cost": float(labor_cost),
+    }
+
+
+def _stage_shift(session, shift: Dict[str, Any]) -> Tuple[WeekSchedule, Shift]:
+    week, values = _shift_column_values(session, shift)
+    shift_id = shift.get("id")
     if shift_id:
         db_shift = session.get(Shift, shift_id)
         if not db_shift:
             raise ValueError(f"Shift with id {shift_id} was not found.")
     else:
-        db_shift = Shift(week_id=week_id)
+        db_shift = Shift(week_id=values["week_id"])
         session.add(db_shift)
+    for column, value in values.items():
+        if column != "week_id":
+            setattr(db_shift, column, value)
+    return week, db_shift
+
 
-    db_shift.employee_id = shift.get("employee_id")
-    db_shift.role = role
-    db_shift.start = start
-    db_shift.end = end
-    db_shift.location = shift.get("location", "") or ""
-    db_shift.notes = shift.get("notes", "") or ""
-    db_shift.status = (shift.get("status") or "draft").lower()
-    db_shift.labor_rate = labor_rate
-    db_shift.labor_cost = float(labor_cost)
+def upsert_shift(session, shift: Dict[str, Any]) -> int:
+    week, db_shift = _stage_shift(session, shift)
     _apply_week_status(session, week, "draft")
     session.commit()
     session.refresh(db_shift)
     return db_shift.id
 
 
+def bulk_upsert_shifts(session, shifts: Iterable[Dict[str, Any]]) -> List[int]:
+    """Insert or update many shifts with one week-status pass per week and a single commit."""
+    staged: List[Shift] = []
+    weeks: Dict[int, WeekSchedule] = {}
+    for shift in shifts:
+        week, db_shift = _stage_shift(session, shift)
+        staged.append(db_shift)
+        weeks.setdefault(week.id, week)
+    for week in weeks.values():
+        _apply_week_status(session, week, "draft")
+    session.commit()
+    return [db_shift.id for db_shift in staged]
+
+
 def delete_shift(session, shift_id: int) -> None:
     db_shift = session.get(Shift, shift_id)
     if not db_shift:
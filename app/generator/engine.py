@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import copy
 import datetime
+import heapq
 import json
 import math
 import random
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from sqlalchemy import delete, select
-from sqlalchemy.orm import selectinload
 
 from database import (
     Employee,
@@ -22,7 +27,8 @@ from database import (
     list_modifiers_for_week,
     record_audit_log,
     get_employee_role_wages,
-    upsert_shift,
+    get_employee_unavailability_windows,
+    bulk_upsert_shifts,
 )
 from policy import (
     PATTERN_TEMPLATES,
@@ -49,6 +55,16 @@ from roles import is_manager_role, normalize_role, role_matches, role_group
 UTC = datetime.timezone.utc
 WEEKDAY_TOKENS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 HALF_HOUR = datetime.timedelta(minutes=30)
+HALF_HOUR_SECONDS = 1800
+ONE_MINUTE = datetime.timedelta(minutes=1)
+_TIME_MIN = datetime.time.min
+_TIMEDELTA = datetime.timedelta
+_COMBINE = datetime.datetime.combine
+# Longest span a non-closer plan entry may cover.
+_MAX_PLAN_SPAN = datetime.timedelta(hours=8)
+_HOH_ALL_ROLES = normalize_role("HOH - All Roles")
+_CASHIER_ALL_ROLES = normalize_role("Cashier - All Roles")
+_BARTENDER_OPENER = normalize_role("Bartender - Opener")
 LABOR_PER_100_SALES = {"Servers": 0.18, "Bartenders": 0.05, "Kitchen": 0.2, "Cashier": 0.06}
 MIN_STAFF_DEFAULTS = {"Servers": 1, "Server": 1, "Bartenders": 1, "Bartender": 1, "Kitchen": 2, "Cashier": 0}
 GLOBAL_CUT_RANKS = {
@@ -106,9 +122,66 @@ SHIFT_TEMPLATE_CONFIG = {
 SHIFT_STYLE_ORDER = {"Open": 0, "Prep": 0, "Lunch": 1, "Mid": 1, "Shoulder": 2, "Dinner": 3, "Late": 4}
 MIN_SHIFT_HOURS = 4.0
 MAX_SHIFT_HOURS = 9.0
+MIN_SHIFT_SLOTS = int(math.ceil(MIN_SHIFT_HOURS * 2))
+MAX_SHIFT_SLOTS = int(math.floor(MAX_SHIFT_HOURS * 2))
+_ORDINAL_SUFFIX = tuple(
+    "th" if 10 <= value <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(value % 10, "th") for value in range(100)
+)
+_EMPTY_NOTES: Mapping[str, Any] = MappingProxyType({})
+
+
+def _clamp(value: float, minimum: float, maximum: float) -> float:
+    return max(minimum, min(maximum, value))
+
+
+def _to_float(value: Any, *, default: float = 0.0) -> float:
+    # Policy values are usually numbers already; skip the try/except setup for them.
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_int(value: Any, *, default: int = 0) -> int:
+    # Counts are usually ints already; return them as-is (bools still go through int()).
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@lru_cache(maxsize=1024)
+def _parse_projection_notes(raw: Optional[str]) -> Mapping[str, Any]:
+    """Parse stored projection notes; results are shared, so callers must treat them as read-only."""
+    if not raw:
+        return _EMPTY_NOTES
+    try:
+        parsed = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return _EMPTY_NOTES
+    return parsed if isinstance(parsed, dict) else _EMPTY_NOTES
+
 
+@lru_cache(maxsize=256)
+def _label_minutes(label: str) -> Optional[int]:
+    """Memoized parse_time_label; template and preset labels repeat across every day and role."""
+    return parse_time_label(label)
 
-@dataclass
+
+def _window_minutes(
+    date_value: datetime.date, start: datetime.datetime, end: datetime.datetime
+) -> Tuple[int, int]:
+    """Minutes from ``date_value``'s midnight to ``start``/``end``; the end never precedes the start."""
+    start_minutes = (start.date() - date_value).days * 1440 + start.hour * 60 + start.minute
+    end_minutes = (end.date() - date_value).days * 1440 + end.hour * 60 + end.minute
+    return start_minutes, max(start_minutes, end_minutes)
+
+
+@dataclass(slots=True)
 class BlockDemand:
     day_index: int
     date: datetime.date
@@ -128,10 +201,22 @@ class BlockDemand:
     max_capacity: int = 0
     cut_score: float = 0.0
     cut_factors: Dict[str, float] = field(default_factory=dict)
-
-    @property
-    def duration_hours(self) -> float:
-        return max(0.0, (self.end - self.start).total_seconds() / 3600)
+    # Minute window (set at construction) and per-day segments (filled on first use); start/end are fixed once a
+    # demand is built.
+    window_minutes: Optional[Tuple[int, int]] = field(init=False, repr=False, compare=False)
+    day_segments: Optional[Tuple[Tuple[int, int, int, int], ...]] = field(default=None, repr=False, compare=False)
+    # Cut rotation rank of role_group; set by the generator when it builds the demand, else on first use.
+    cut_rank: Optional[int] = field(default=None, repr=False, compare=False)
+    # Span and per-head cost derived from start/end/hourly_rate at construction.
+    duration_hours: float = field(init=False, repr=False, compare=False)
+    slot_cost: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.duration_hours = max(0.0, (self.end - self.start).total_seconds() / 3600)
+        self.slot_cost = max(0.0, self.duration_hours * max(0.0, self.hourly_rate or 0.0))
+        self.window_minutes = (
+            _window_minutes(self.date, self.start, self.end) if isinstance(self.date, datetime.date) else None
+        )
 
 
 class ScheduleGenerator:
@@ -150,6 +235,8 @@ class ScheduleGenerator:
         self.policy = policy or {}
         self.actor = actor or "system"
         self.wage_overrides = wage_overrides or {}
+        # Policy and wage overrides are fixed for the engine's lifetime, so role wages resolve once per role.
+        self._role_wage_cache: Dict[str, float] = {}
         try:
             self.cut_relax_level: int = max(0, int(cut_relax_level))
         except (TypeError, ValueError):
@@ -158,30 +245,36 @@ class ScheduleGenerator:
         self.roles_config: Dict[str, Dict] = {
             role: config for role, config in raw_roles.items() if not is_manager_role(role)
         }
+        self._daily_boosts: Dict[str, Tuple[int, ...]] = {}
         global_cfg = self.policy.get("global") or {}
         self.max_hours_per_week: float = float(global_cfg.get("max_hours_week", 40) or 40)
         self.max_consecutive_days: int = int(global_cfg.get("max_consecutive_days", 6) or 6)
         # Shift snapping fixed at 15-minute increments.
         self.round_to_minutes: int = 15
+        self._nudge_step = datetime.timedelta(minutes=max(15, self.round_to_minutes))
+        self._tolerance_5 = max(5, self.round_to_minutes)
+        self._tolerance_1 = max(1, self.round_to_minutes)
+        self._tolerance_5_td = datetime.timedelta(minutes=self._tolerance_5)
         self.allow_split_shifts: bool = True
         self.overtime_penalty: float = float(global_cfg.get("overtime_penalty", 1.5) or 1.5)
         desired_floor = float(global_cfg.get("desired_hours_floor_pct", 0.85) or 0.0)
         desired_ceiling = float(global_cfg.get("desired_hours_ceiling_pct", 1.15) or 0.0)
-        self.desired_hours_floor_pct: float = self._clamp(desired_floor, 0.0, 1.0)
+        self.desired_hours_floor_pct: float = _clamp(desired_floor, 0.0, 1.0)
         min_ceiling = max(self.desired_hours_floor_pct + 0.05, 0.1)
-        self.desired_hours_ceiling_pct: float = self._clamp(max(desired_ceiling, min_ceiling), min_ceiling, 2.0)
+        self.desired_hours_ceiling_pct: float = _clamp(max(desired_ceiling, min_ceiling), min_ceiling, 2.0)
         # Open buffer is fixed at 30 minutes (10:30-11:00 window).
         self.open_buffer_minutes: int = 30
         self.close_buffer_minutes: int = int(global_cfg.get("close_buffer_minutes", 35) or 0)
+        self._open_buffer_delta = datetime.timedelta(minutes=self._round_minutes(max(0, self.open_buffer_minutes)))
         self.max_hours_per_day: float = float(global_cfg.get("max_hours_day", 8.0) or 8.0)
         labor_pct = float(global_cfg.get("labor_budget_pct", 0.27) or 0.0)
         if labor_pct > 1.0:
             labor_pct /= 100.0
-        self.labor_budget_pct = self._clamp(labor_pct, 0.05, 0.9)
+        self.labor_budget_pct = _clamp(labor_pct, 0.05, 0.9)
         labor_tol = float(global_cfg.get("labor_budget_tolerance_pct", 0.08) or 0.0)
         if labor_tol > 1.0:
             labor_tol /= 100.0
-        self.labor_budget_tolerance = self._clamp(labor_tol, 0.0, 0.5)
+        self.labor_budget_tolerance = _clamp(labor_tol, 0.0, 0.5)
         self.budget_target_ratio = max(0.75, 1.0 - (self.labor_budget_tolerance / 2.0))
         self.pre_engine = pre_engine_settings(self.policy)
         self.pre_engine_staffing = self.pre_engine.get("staffing", {})
@@ -218,18 +311,49 @@ class ScheduleGenerator:
         self.volume_thresholds = self.pre_engine_staffing.get("volume_thresholds", {})
         self.section_weights = resolve_section_weights(self.policy)
         self.hoh_thresholds = resolve_hoh_thresholds(self.policy)
+        # The policy is fixed for this generator, so knobs read per day or per plan are coerced once here.
+        self.hoh_mode: str = (self.policy.get("hoh_mode") or "auto").lower()
+        self._hoh_combo_max: float = float(self.hoh_thresholds.get("combo_enabled_max", 0.55))
+        self._hoh_split_threshold: float = float(self.hoh_thresholds.get("split_threshold", 0.75))
+        self._hoh_peak_threshold: float = float(self.hoh_thresholds.get("peak_threshold", 1.0))
+        self._section_weight_by_label: Dict[str, float] = {
+            "patio": float(self.section_weights.get("patio", 0.5)),
+            "cocktail": float(self.section_weights.get("cocktail", 0.7)),
+            "dining": float(self.section_weights.get("dining", 1.0)),
+        }
+        seasonal_cfg = self.policy.get("seasonal_settings", {}) if isinstance(self.policy, dict) else {}
+        patio_enabled = seasonal_cfg.get("server_patio_enabled")
+        if patio_enabled is None:
+            patio_enabled = self.roles_config.get("Server - Patio", {}).get("enabled", False)
+        self.server_patio_enabled: bool = bool(patio_enabled)
         self.errors: List[str] = []
 
         self.employees: List[Dict[str, Any]] = []
-        self.modifiers_by_day: Dict[int, List[Dict[str, Any]]] = {}
+        self._role_pools: Dict[str, List[Dict[str, Any]]] = {}
+        self.modifiers_by_day: List[List[Dict[str, Any]]] = [[] for _ in range(7)]
+        self._day_sales: Tuple[float, ...] = ()
+        self._demand_index_by_day: Tuple[float, ...] = ()
+        self._modifier_counts: Tuple[int, ...] = ()
         self.day_contexts: List[Dict[str, Any]] = []
         self.role_group_settings: Dict[str, Dict[str, Any]] = self._load_role_group_settings()
         self.group_budget_by_day: List[Dict[str, float]] = []
+        self._group_budget_total: Optional[float] = None
         self.warnings: List[str] = []
         self.cut_insights: List[Dict[str, Any]] = []
         self.unfilled_slots: List[Dict[str, Any]] = []
         self.section_coverage: List[Dict[str, Any]] = []
+        # Open opener links per day, in creation order, so follow-up lookups skip employees with empty queues.
+        self._opener_index: Dict[int, List[Tuple[Dict[str, Any], Dict[str, Any]]]] = {idx: [] for idx in range(7)}
+        self._shifts_by_day: List[List[Dict[str, Any]]] = [[] for _ in range(7)]
         self.interchangeable_groups: Set[str] = {"Cashier"}
+        self._week_origin: Optional[datetime.datetime] = None
+        self._week_dates: Tuple[datetime.date, ...] = ()
+        self._week_dates_iso: Tuple[str, ...] = ()
+        self._week_start_ordinal = 0
+        self._day_labels: Tuple[str, ...] = ()
+        self._day_index_by_date: Dict[datetime.date, int] = {}
+        self._week_midnights: Tuple[datetime.datetime, ...] = ()
+        self._midnights: Dict[datetime.date, datetime.datetime] = {}
         self.random = random.Random()
         self.group_pressure: Dict[int, Dict[str, float]] = {}
         self.group_aliases = {"heart of house": "Kitchen", "cashier & takeout": "Cashier"}
@@ -255,28 +379,59 @@ class ScheduleGenerator:
         self.shift_presets = self.policy.get("shift_presets") if isinstance(self.policy, dict) else {}
         if not isinstance(self.shift_presets, dict) or not self.shift_presets:
             self.shift_presets = copy.deepcopy(SHIFT_PRESET_DEFAULTS)
+        # Templates and presets are fixed for the run; resolved windows are kept as minute offsets by lookup key.
+        self._pattern_by_key: Dict[Tuple[str, str, str], Tuple[Tuple[int, int], ...]] = {}
+        self._pattern_entry_by_key: Dict[Tuple[str, str, str], Optional[Tuple[int, int]]] = {}
+        self._business_minutes: Dict[datetime.date, Tuple[int, int]] = {}
+        self._role_meta: Dict[str, Dict[str, Any]] = {}
+        self._precompute_role_metadata()
+
+    def _precompute_role_metadata(self) -> None:
+        """Resolve name-derived role attributes once for every configured role."""
+        for role_name, role_cfg in self.roles_config.items():
+            self._role_meta[role_name] = self._resolve_role_metadata(role_name, role_cfg)
+
+    def _resolve_role_metadata(self, role_name: str, role_cfg: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        normalized = normalize_role(role_name)
+        inferred_group = role_group(role_name)
+        return {
+            "normalized": normalized,
+            "group": inferred_group,
+            "canonical_group": self._canonical_group(inferred_group),
+            "group_name": self._role_group_name(role_name, role_cfg),
+            "is_opener": "opener" in normalized,
+            "is_closer": "closer" in normalized,
+            "is_cashier": any(keyword in normalized for keyword in ("cashier", "takeout", "to-go")),
+        }
 
-    @staticmethod
-    def _clamp(value: float, minimum: float, maximum: float) -> float:
-        return max(minimum, min(maximum, value))
-
-    @staticmethod
-    def _to_float(value: Any, *, default: float = 0.0) -> float:
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return default
+    def _role_metadata(self, role_name: str) -> Dict[str, Any]:
+        meta = self._role_meta.get(role_name)
+        if meta is None:
+            meta = self._role_meta[role_name] = self._resolve_role_metadata(
+                role_name, self.roles_config.get(role_name)
+            )
+        return meta
 
-    @staticmethod
-    def _to_int(value: Any, *, default: int = 0) -> int:
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return default
+    def _open_close_minutes(self, date_value: datetime.date) -> Tuple[int, int]:
+        """Policy open/close minutes for a date, resolved once per date."""
+        minutes = self._business_minutes.get(date_value)
+        if minutes is None:
+            minutes = self._business_minutes[date_value] = (
+                open_minutes(self.policy, date_value),
+                close_minutes(self.policy, date_value),
+            )
+        return minutes
 
     def _round_minutes(self, minutes: float) -> int:
         """Round a minute value to the nearest configured step."""
         step = max(1, self.round_to_minutes)
+        if type(minutes) is int:
+            # Integer path with the same half-to-even tie rule as round(); no float division.
+            quotient, remainder = divmod(minutes, step)
+            twice = remainder * 2
+            if twice > step or (twice == step and quotient & 1):
+                quotient += 1
+            return quotient * step
         return int(round(minutes / step) * step)
 
     def generate(self, week_start_date: datetime.date) -> Dict[str, Any]:
@@ -296,53 +451,65 @@ class ScheduleGenerator:
             week.iso_week,
             week.label,
         )
-        week.context_id = context.id
-        self.session.commit()
-
-        self._reset_week(week)
-        self.employees = self._load_employee_profiles()
-        self.modifiers_by_day = self._load_modifiers(week.week_start_date)
-        self.day_contexts = self._build_day_contexts(context, week.week_start_date)
-        self.group_budget_by_day = self._build_group_budgets()
-        self._base_employees = copy.deepcopy(self.employees)
-        max_attempts = max(1, int(self.pre_engine.get("generation_attempts", 3) or 3))
-        best_payload = None
-        best_score = float("inf")
-        for attempt in range(max_attempts):
-            self._reset_attempt_state()
-            self.random.shuffle(self.employees)
-            assignments = self._build_assignments_once(week.week_start_date)
-            missing_required = self._missing_required_roles(assignments)
-            score = missing_required * 1000 + len(self.unfilled_slots) * 100 + len(self.errors) * 10 + len(self.warnings)
-            if score < best_score:
-                best_score = score
-                best_payload = {
-                    "assignments": assignments,
-                    "warnings": list(self.warnings),
-                    "errors": list(self.errors),
-                    "cut_insights": list(self.cut_insights),
-                    "section_coverage": list(self.section_coverage),
+        try:
+            # The shift wipe, context link and new shifts share one transaction: bulk_upsert_shifts commits it
+            # and any failure before then rolls it back, leaving the previous schedule in place.
+            week.context_id = context.id
+            self._reset_week(week)
+            self.employees = self._load_employee_profiles()
+            self.modifiers_by_day = self._load_modifiers(week.week_start_date)
+            self.day_contexts = self._build_day_contexts(context, week.week_start_date)
+            self._day_labels = tuple(self._day_label(day_index) for day_index in range(7))
+            self.group_budget_by_day = self._build_group_budgets()
+            self._group_budget_total = None
+            self._base_employees = copy.deepcopy(self.employees)
+            max_attempts = max(1, int(self.pre_engine.get("generation_attempts", 3) or 3))
+            best_payload = None
+            best_score = float("inf")
+            for attempt in range(max_attempts):
+                # Attempt 0 runs on the freshly loaded records; only retries need a clean copy of the baseline.
+                self._reset_attempt_state(restore_employees=attempt > 0)
+                self.random.shuffle(self.employees)
+                assignments = self._build_assignments_once(week.week_start_date)
+                missing_required = self._missing_required_roles(assignments)
+                score = (
+                    missing_required * 1000
+                    + len(self.unfilled_slots) * 100
+                    + len(self.errors) * 10
+                    + len(self.warnings)
+                )
+                if score < best_score:
+                    best_score = score
+                    best_payload = {
+                        "assignments": assignments,
+                        "warnings": list(self.warnings),
+                        "errors": list(self.errors),
+                        "cut_insights": list(self.cut_insights),
+                        "section_coverage": list(self.section_coverage),
+                    }
+                if best_score == 0:
+                    break
+            if best_payload is None:
+                self.session.commit()
+                return {
+                    "week_id": week.id,
+                    "days": [],
+                    "total_cost": 0.0,
+                    "warnings": ["Failed to generate any schedule."],
+                    "cut_insights": [],
                 }
-            if best_score == 0:
-                break
-        if best_payload is None:
-            return {
-                "week_id": week.id,
-                "days": [],
-                "total_cost": 0.0,
-                "warnings": ["Failed to generate any schedule."],
-                "cut_insights": [],
-            }
-        assignments = best_payload["assignments"]
-        self.warnings = best_payload["warnings"]
-        self.errors = best_payload["errors"]
-        self.cut_insights = best_payload["cut_insights"]
-        self.section_coverage = best_payload["section_coverage"]
-
-        created_ids: List[int] = []
-        for payload in assignments:
-            payload.update({"week_id": week.id, "status": "draft", "week_start": week.week_start_date})
-            created_ids.append(upsert_shift(self.session, payload))
+            assignments = best_payload["assignments"]
+            self.warnings = best_payload["warnings"]
+            self.errors = best_payload["errors"]
+            self.cut_insights = best_payload["cut_insights"]
+            self.section_coverage = best_payload["section_coverage"]
+
+            for payload in assignments:
+                payload.update({"week_id": week.id, "status": "draft", "week_start": week.week_start_date})
+            created_ids = bulk_upsert_shifts(self.session, assignments)
+        except Exception:
+            self.session.rollback()
+            raise
 
         summary = self._build_summary(week, assignments)
         summary["warnings"].extend(self.warnings)
@@ -361,12 +528,11 @@ class ScheduleGenerator:
     def _reset_week(self, week: WeekSchedule) -> None:
         self.session.execute(delete(Shift).where(Shift.week_id == week.id))
         week.status = "draft"
-        self.session.commit()
         self.unfilled_slots = []
         self.errors = []
         self.manager_fallback_counts = {idx: {"am": 0, "pm": 0} for idx in range(7)}
 
-    def _reset_attempt_state(self) -> None:
+    def _reset_attempt_state(self, *, restore_employees: bool = True) -> None:
         """Clear per-attempt state so retries do not leak assignments or warnings."""
         self.warnings = []
         self.errors = []
@@ -375,23 +541,30 @@ class ScheduleGenerator:
         self.unfilled_slots = []
         self.current_slot_matrix = {}
         self.manager_fallback_counts = {idx: {"am": 0, "pm": 0} for idx in range(7)}
-        if getattr(self, "_base_employees", None):
+        self._opener_index = {idx: [] for idx in range(7)}
+        self._shifts_by_day = [[] for _ in range(7)]
+        self._role_pools = {}
+        if restore_employees and getattr(self, "_base_employees", None):
             self.employees = copy.deepcopy(self._base_employees)
         if getattr(self, "employees", None):
             self.employee_lookup = {emp["id"]: emp for emp in self.employees if emp.get("id") is not None}
             for emp in self.employees:
                 emp["total_hours"] = 0.0
-                emp["assignments"] = {idx: [] for idx in range(7)}
-                emp["day_last_block_end"] = {idx: None for idx in range(7)}
-                emp["last_assignment_end"] = None
+                emp["assignments"] = [[] for _ in range(7)]
+                emp["day_starts"] = [array("i") for _ in range(7)]
+                emp["day_end_max"] = [array("i") for _ in range(7)]
+                emp["day_minutes"] = [0] * 7
+                emp["day_earliest_start"] = [None] * 7
+                emp["day_last_block_end"] = [None] * 7
                 emp["days_with_assignments"] = set()
                 emp["last_day_index"] = None
                 emp["consecutive_days"] = 0
                 emp["pending_open_links"] = {idx: [] for idx in range(7)}
-                emp["day_meta"] = {idx: [] for idx in range(7)}
+                emp["day_meta"] = [[] for _ in range(7)]
 
     def _build_assignments_once(self, week_start: datetime.date) -> List[Dict[str, Any]]:
         """Single-pass generation used by the attempt loop to pick the best schedule."""
+        self._set_week_dates(week_start)
         plans = self._build_bww_week_plan(week_start)
         self._apply_bww_budget(plans)
         assignments = self._assign_from_plans(plans)
@@ -399,11 +572,12 @@ class ScheduleGenerator:
 
         def _day_map(shifts: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
             mapping: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+            week_ordinal = self._week_start_ordinal
             for shift in shifts:
                 start = shift.get("start")
                 if not isinstance(start, datetime.datetime):
                     continue
-                mapping[self._day_index_from_datetime(week_start, start)].append(shift)
+                mapping[start.toordinal() - week_ordinal].append(shift)
             return mapping
 
         day_map = _day_map(assignments)
@@ -412,10 +586,14 @@ class ScheduleGenerator:
         self._enforce_shift_continuity(assignments, week_start)
         day_map = _day_map(assignments)
         self._normalize_bartender_openers(assignments)
+        for day_shifts in day_map.values():
+            for shift in day_shifts:
+                self._stamp_continuity_fields(shift)
         self._ensure_opener_followups(day_map, assignments, week_start)
         self._force_bartender_opener_pair(assignments)
         self._ensure_closer_continuity(day_map, assignments, week_start)
         self._warn_unpaired_openers()
+        self._shifts_by_day = self._bucket_shifts_by_day(assignments)
         self._check_section_thresholds(assignments)
         self._record_required_role_gaps(assignments)
         return assignments
@@ -425,13 +603,9 @@ class ScheduleGenerator:
         if not self.required_role_labels:
             return 0
         missing = 0
-        for day_index in range(7):
+        for day_shifts in self._shifts_by_day:
             for role_label in self.required_role_labels:
-                has_role = any(
-                    role_matches(shift.get("role", ""), role_label) and self._day_index_for_shift(shift) == day_index
-                    for shift in assignments
-                )
-                if not has_role:
+                if not any(role_matches(shift.get("role", ""), role_label) for shift in day_shifts):
                     missing += 1
         return missing
 
@@ -439,23 +613,40 @@ class ScheduleGenerator:
         stmt = (
             select(Employee)
             .where(Employee.status == "active")
-            .options(selectinload(Employee.unavailability))
             .order_by(Employee.full_name.asc())
         )
         employees: List[Dict[str, Any]] = []
         self.employee_lookup: Dict[int, Dict[str, Any]] = {}
         source = self.employee_session or self.session
         rows = list(source.scalars(stmt))
-        wage_overrides = get_employee_role_wages(self.employee_session or self.session, [emp.id for emp in rows if emp.id])
+        employee_ids = [emp.id for emp in rows if emp.id]
+        wage_overrides = get_employee_role_wages(source, employee_ids)
+        # One column query for every roster member's windows instead of hydrating ORM children per employee.
+        unavailability_by_employee = get_employee_unavailability_windows(source, employee_ids) if employee_ids else {}
         for employee in rows:
-            role_set = {role.strip() for role in employee.role_list if role.strip()}
+            # role_list already strips and drops blanks; the frozenset is shared read-only by every check.
+            role_set = frozenset(employee.role_list)
             if not role_set:
                 continue
             unavailability = {index: [] for index in range(7)}
-            for entry in employee.unavailability:
-                start_minutes = entry.start_time.hour * 60 + entry.start_time.minute
-                end_minutes = entry.end_time.hour * 60 + entry.end_time.minute
-                unavailability.setdefault(entry.day_of_week, []).append((start_minutes, end_minutes))
+            for day_of_week, windows in unavailability_by_employee.get(employee.id, {}).items():
+                unavailability.setdefault(day_of_week, []).extend(windows)
+            # Proper windows fold into one minute bitmask per day; empty or inverted ones keep the interval
+            # test, stored as sorted starts plus a running max of ends (only days that have any).
+            unavailability_masks = [0] * 7
+            residual_starts: Dict[int, array] = {}
+            residual_end_max: Dict[int, array] = {}
+            for day_of_week, windows in unavailability.items():
+                windows.sort()
+                for window_start, window_end in windows:
+                    if window_end > window_start:
+                        if 0 <= day_of_week < 7:
+                            window_mask = ((1 << (window_end - window_start)) - 1) << window_start
+                            unavailability_masks[day_of_week] |= window_mask
+                    else:
+                        end_max = residual_end_max.setdefault(day_of_week, array("i"))
+                        end_max.append(max(end_max[-1], window_end) if end_max else window_end)
+                        residual_starts.setdefault(day_of_week, array("i")).append(window_start)
             desired_hours = max(0.0, float(employee.desired_hours or 0))
             desired_floor = desired_hours * self.desired_hours_floor_pct if desired_hours else 0.0
             desired_ceiling = desired_hours * self.desired_hours_ceiling_pct if desired_hours else self.max_hours_per_week
@@ -470,37 +661,53 @@ class ScheduleGenerator:
                 "desired_floor": desired_floor,
                 "desired_ceiling": desired_ceiling,
                 "total_hours": 0.0,
-                "assignments": {idx: [] for idx in range(7)},
-                "day_last_block_end": {idx: None for idx in range(7)},
-                "last_assignment_end": None,
+                "assignments": [[] for _ in range(7)],
+                "day_starts": [array("i") for _ in range(7)],
+                "day_end_max": [array("i") for _ in range(7)],
+                "day_minutes": [0] * 7,
+                "day_earliest_start": [None] * 7,
+                "day_last_block_end": [None] * 7,
                 "unavailability": unavailability,
+                "unavailability_masks": unavailability_masks,
+                "unavailability_residual_starts": residual_starts,
+                "unavailability_residual_end_max": residual_end_max,
                 "days_with_assignments": set(),
                 "last_day_index": None,
                 "consecutive_days": 0,
                 "pending_open_links": {idx: [] for idx in range(7)},
                 "wage_overrides": wage_overrides.get(employee.id, {}),
             }
+            record["score_profile"] = self._employee_score_profile(record)
+            # Roles and policy are fixed for the run, so resolve coverage of every policy role up front.
+            record["role_cover"] = {
+                role_name: self._resolve_role_cover(record, role_name) for role_name in self.roles_config
+            }
             employees.append(record)
             if employee.id is not None:
                 self.employee_lookup[employee.id] = record
         return employees
 
-    def _load_modifiers(self, week_start: datetime.date) -> Dict[int, List[Dict[str, Any]]]:
+    def _load_modifiers(self, week_start: datetime.date) -> List[List[Dict[str, Any]]]:
         modifiers = list_modifiers_for_week(self.session, week_start)
-        mapping: Dict[int, List[Dict[str, Any]]] = {idx: [] for idx in range(7)}
+        mapping: List[List[Dict[str, Any]]] = [[] for _ in range(7)]
         for modifier in modifiers:
             day_idx = int(modifier.get("day_of_week", 0))
+            if not 0 <= day_idx < 7:
+                continue
             start_time = modifier.get("start_time")
             end_time = modifier.get("end_time")
             pct = float(modifier.get("pct_change", 0) or 0)
             start_minutes = start_time.hour * 60 + start_time.minute if start_time else 0
             end_minutes = end_time.hour * 60 + end_time.minute if end_time else 24 * 60
-            mapping.setdefault(day_idx, []).append(
+            fraction = max(0.0, end_minutes - start_minutes) / (24 * 60)
+            mapping[day_idx].append(
                 {
                     "start": start_minutes,
                     "end": end_minutes,
                     "pct": pct,
                     "multiplier": 1.0 + (pct / 100.0),
+                    # Share of the day's sales lift, summed by _day_modifier_multiplier.
+                    "lift": (pct / 100.0) * max(fraction, 0.1),
                 }
             )
         return mapping
@@ -595,6 +802,12 @@ class ScheduleGenerator:
             normalized.append(label)
         return normalized
 
+    def _demand_cut_rank(self, demand: BlockDemand) -> int:
+        rank = demand.cut_rank
+        if rank is None:
+            rank = demand.cut_rank = self.cut_priority_rank.get(demand.role_group, 2)
+        return rank
+
     def _build_cut_priority_rank(self) -> Dict[str, int]:
         """Convert the configured rotation into a numeric rank for earlier pull weighting."""
         base = {"Cashier": 0, "Servers": 1, "Kitchen": 2, "Bartenders": 3, "Other": 2}
@@ -627,7 +840,7 @@ class ScheduleGenerator:
         for day_index in range(7):
             projection = projection_map.get(day_index)
             sales = float(projection.projected_sales_amount) if projection else 0.0
-            notes_payload = self._parse_projection_notes(projection.projected_notes if projection else "")
+            notes_payload = _parse_projection_notes(projection.projected_notes if projection else "")
             modifier_multiplier = self._day_modifier_multiplier(day_index)
             adjusted_sales = sales * modifier_multiplier
             adjusted_values.append(adjusted_sales)
@@ -644,12 +857,20 @@ class ScheduleGenerator:
                 }
             )
 
+        # Adjusted sales, modifier counts and the date-to-day lookup are fixed for the week; per-block code reads them.
+        self._day_sales = tuple(adjusted_values)
+        self._modifier_counts = tuple(len(windows) for windows in self.modifiers_by_day)
+        self._day_index_by_date = {ctx["date"]: ctx["day_index"] for ctx in contexts}
+
         max_sales = max(adjusted_values) if adjusted_values else 0.0
         if max_sales <= 0:
             max_sales = 1.0
 
+        mapping = self.policy.get("demand_mapping") or {}
+        index_specs = list((mapping.get("indices") or {}).items())
         for ctx, adjusted in zip(contexts, adjusted_values):
-            ctx["indices"] = self._compute_indices(ctx, adjusted, max_sales)
+            ctx["indices"] = self._compute_indices(ctx, adjusted, max_sales, index_specs=index_specs)
+        self._demand_index_by_day = tuple(ctx["indices"].get("demand_index", 1.0) for ctx in contexts)
         return contexts
 
     def _build_group_budgets(self) -> List[Dict[str, float]]:
@@ -658,34 +879,43 @@ class ScheduleGenerator:
             return budgets
         if not self.role_group_settings:
             return [{} for _ in self.day_contexts]
+        # Group allocation shares are the same every day; resolve them once and scale each day's total.
+        group_pcts: List[Tuple[str, float]] = []
+        for group, spec in self.role_group_settings.items():
+            pct = float(spec.get("allocation_pct", 0.0) or 0.0)
+            if pct > 1.0:
+                pct /= 100.0
+            pct = max(0.0, min(1.0, pct))
+            if pct > 0.0:
+                group_pcts.append((group, pct))
+        labor_budget_pct = self.labor_budget_pct
         for ctx in self.day_contexts:
             sales = float(ctx.get("sales", 0.0) or 0.0)
             modifier_multiplier = float(ctx.get("modifier_multiplier", 1.0) or 1.0)
-            adjusted_sales = sales * modifier_multiplier
-            total_budget = adjusted_sales * self.labor_budget_pct
-            day_budget: Dict[str, float] = {}
-            for group, spec in self.role_group_settings.items():
-                pct = float(spec.get("allocation_pct", 0.0) or 0.0)
-                if pct > 1.0:
-                    pct /= 100.0
-                pct = max(0.0, min(1.0, pct))
-                if pct <= 0.0:
-                    continue
-                day_budget[group] = round(total_budget * pct, 2)
-            budgets.append(day_budget)
+            total_budget = sales * modifier_multiplier * labor_budget_pct
+            budgets.append({group: round(total_budget * pct, 2) for group, pct in group_pcts})
         if not budgets:
             budgets = [{} for _ in self.day_contexts]
         return budgets
 
-    def _compute_indices(self, day_ctx: Dict[str, Any], adjusted_sales: float, max_sales: float) -> Dict[str, float]:
+    def _compute_indices(
+        self,
+        day_ctx: Dict[str, Any],
+        adjusted_sales: float,
+        max_sales: float,
+        *,
+        index_specs: Optional[List[Tuple[str, Any]]] = None,
+    ) -> Dict[str, float]:
         indices: Dict[str, float] = {}
-        mapping = self.policy.get("demand_mapping") or {}
+        if index_specs is None:
+            mapping = self.policy.get("demand_mapping") or {}
+            index_specs = list((mapping.get("indices") or {}).items())
         base_index = adjusted_sales / max_sales if max_sales > 0 else 0.0
         base_index = max(0.0, min(1.5, base_index))
         indices["demand_index"] = round(base_index, 3)
 
         extra_data = day_ctx.get("notes", {})
-        for name, spec in (mapping.get("indices") or {}).items():
+        for name, spec in index_specs:
             if name == "demand_index":
                 continue
             value = None
@@ -706,15 +936,10 @@ class ScheduleGenerator:
         return indices
 
     def _day_modifier_multiplier(self, day_index: int) -> float:
-        windows = self.modifiers_by_day.get(day_index, [])
+        windows = self.modifiers_by_day[day_index]
         if not windows:
             return 1.0
-        total = 0.0
-        for window in windows:
-            span = max(0.0, window["end"] - window["start"])
-            fraction = span / (24 * 60)
-            total += (window["pct"] / 100.0) * max(fraction, 0.1)
-        return max(0.5, 1.0 + total)
+        return max(0.5, 1.0 + sum(window["lift"] for window in windows))
 
     def _compute_block_demands(self, week_start: datetime.date) -> Dict[Tuple[int, str], Dict[str, Any]]:
         """
@@ -723,12 +948,16 @@ class ScheduleGenerator:
         enforces role minima so downstream shifts stay smooth around transitions.
         """
         matrix: Dict[Tuple[int, str], Dict[str, Any]] = {}
-        roles_by_group = self._roles_by_group()
+        # Group staffing floors and labor ratios do not vary by day, so resolve them before the day loop.
+        group_params = [
+            (group_name, self._minimum_staff_for_group(group_name), LABOR_PER_100_SALES.get(group_name, 0.12))
+            for group_name, role_names in self._roles_by_group().items()
+            if role_names
+        ]
         for day_index in range(7):
             date_value = week_start + datetime.timedelta(days=day_index)
             day_start = datetime.datetime.combine(date_value, datetime.time.min, tzinfo=UTC)
-            open_min = open_minutes(self.policy, date_value)
-            close_min = close_minutes(self.policy, date_value)
+            open_min, close_min = self._open_close_minutes(date_value)
             if close_min <= open_min:
                 close_min += 24 * 60
             open_dt = day_start + datetime.timedelta(minutes=open_min)
@@ -744,20 +973,14 @@ class ScheduleGenerator:
             adjusted_sales = float(ctx.get("sales", 0.0) or 0.0) * float(ctx.get("modifier_multiplier", 1.0) or 1.0)
             weights = self._slot_sales_weights(day_index, slots, notes)
             total_weight = sum(weights) or 1.0
-            for group_name, role_names in roles_by_group.items():
-                if not role_names:
-                    continue
-                min_staff = self._minimum_staff_for_group(group_name)
-                labor_ratio = LABOR_PER_100_SALES.get(group_name, 0.12)
-                targets: List[int] = []
-                minima: List[int] = []
-                for weight, slot in zip(weights, slots):
-                    sales_for_slot = adjusted_sales * (weight / total_weight)
-                    hours_needed = (sales_for_slot / 100.0) * labor_ratio
-                    target = int(round(hours_needed / 0.5))
-                    target = max(min_staff, target)
-                    targets.append(target)
-                    minima.append(min_staff)
+            # Each slot's share of sales is the same for every group; only the labor ratio differs.
+            slot_sales = [adjusted_sales * (weight / total_weight) for weight, _slot in zip(weights, slots)]
+            for group_name, min_staff, labor_ratio in group_params:
+                targets = [
+                    max(min_staff, int(round(((sales_for_slot / 100.0) * labor_ratio) / 0.5)))
+                    for sales_for_slot in slot_sales
+                ]
+                minima = [min_staff] * len(targets)
                 smoothed = self._smooth_targets(targets, minima)
                 slot_records: List[Dict[str, Any]] = []
                 for idx, slot in enumerate(slots):
@@ -782,21 +1005,23 @@ class ScheduleGenerator:
         if not isinstance(date_value, datetime.date):
             return {}
         day_index = int(day_ctx.get("day_index", date_value.weekday()))
-        day_start = datetime.datetime.combine(date_value, datetime.time.min, tzinfo=UTC)
+        # The frame is laid out in minutes past midnight and only materialized as datetimes at the end.
         # Enforce 11:00 open with a 10:30 opener buffer.
-        open_dt = day_start + datetime.timedelta(hours=11)
-        opener_start = open_dt - datetime.timedelta(minutes=max(1, self.open_buffer_minutes))
+        open_min = 11 * 60
         # AM/PM split follows the policy mid-time.
-        mid_min = mid_minutes(self.policy, date_value)
-        am_end = day_start + datetime.timedelta(minutes=mid_min)
-        if am_end <= open_dt:
-            am_end = open_dt + datetime.timedelta(hours=5)
-        pm_start = am_end
-        close_dt = day_start + datetime.timedelta(minutes=close_minutes(self.policy, date_value))
-        if close_dt <= open_dt:
-            close_dt += datetime.timedelta(days=1)
+        am_end_min = mid_minutes(self.policy, date_value)
+        if am_end_min <= open_min:
+            am_end_min = open_min + 5 * 60
+        close_min = self._open_close_minutes(date_value)[1]
+        if close_min <= open_min:
+            close_min += 24 * 60
         buffer_minutes = max(0, self.close_buffer_minutes or 35)
-        close_end = close_dt + datetime.timedelta(minutes=buffer_minutes)
+        open_dt = self._minutes_to_dt(date_value, open_min)
+        opener_start = self._minutes_to_dt(date_value, open_min - max(1, self.open_buffer_minutes))
+        am_end = self._minutes_to_dt(date_value, am_end_min)
+        pm_start = am_end
+        close_dt = self._minutes_to_dt(date_value, close_min)
+        close_end = self._minutes_to_dt(date_value, close_min + buffer_minutes)
         demand_index = day_ctx.get("indices", {}).get("demand_index", 1.0)
         adjusted_sales = float(day_ctx.get("adjusted_sales", 0.0) or 0.0)
         sales = float(day_ctx.get("sales", 0.0) or 0.0)
@@ -818,13 +1043,10 @@ class ScheduleGenerator:
         }
 
     def _dt_from_label(self, date_value: datetime.date, label: Optional[str]) -> Optional[datetime.datetime]:
-        minutes = parse_time_label(label) if label else None
+        minutes = _label_minutes(label) if label else None
         if minutes is None:
             return None
-        day_offset = minutes // (24 * 60)
-        minute_of_day = minutes % (24 * 60)
-        base = datetime.datetime.combine(date_value, datetime.time.min, tzinfo=UTC)
-        return base + datetime.timedelta(days=day_offset, minutes=minute_of_day)
+        return self._minutes_to_dt(date_value, minutes)
 
     def _policy_preset_window(
         self, role_name: str, group_label: str, period: str, frame: Dict[str, Any]
@@ -852,6 +1074,22 @@ class ScheduleGenerator:
     def _resolve_pattern_window(
         self, group_label: str, day_token: str, period: str, frame: Dict[str, Any]
     ) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+        key = (group_label, day_token, period)
+        if key in self._pattern_entry_by_key:
+            minutes = self._pattern_entry_by_key[key]
+        else:
+            minutes = self._pattern_entry_by_key[key] = self._resolve_pattern_entry_minutes(*key)
+        if minutes is None:
+            return None
+        start = self._minutes_to_dt(frame["date"], minutes[0])
+        end = self._minutes_to_dt(frame["date"], minutes[1])
+        if end <= start:
+            end = end + datetime.timedelta(days=1)
+        return start, end
+
+    def _resolve_pattern_entry_minutes(
+        self, group_label: str, day_token: str, period: str
+    ) -> Optional[Tuple[int, int]]:
         templates = self.pattern_templates.get(group_label, {})
         day_template = templates.get(day_token) or templates.get(day_token.capitalize()) or templates.get("default", {})
         windows = day_template.get(period) if isinstance(day_template, dict) else None
@@ -860,13 +1098,13 @@ class ScheduleGenerator:
         if not windows or not isinstance(windows, list):
             return None
         entry = windows[0] if windows else {}
-        start = self._dt_from_label(frame["date"], entry.get("start"))
-        end = self._dt_from_label(frame["date"], entry.get("end"))
-        if not start or not end:
+        start_label = entry.get("start")
+        end_label = entry.get("end")
+        start_minutes = _label_minutes(start_label) if start_label else None
+        end_minutes = _label_minutes(end_label) if end_label else None
+        if start_minutes is None or end_minutes is None:
             return None
-        if end <= start:
-            end = end + datetime.timedelta(days=1)
-        return start, end
+        return start_minutes, end_minutes
 
     def _build_bww_week_plan(self, week_start: datetime.date) -> List[Dict[str, Any]]:
         plans: List[Dict[str, Any]] = []
@@ -880,7 +1118,8 @@ class ScheduleGenerator:
             plans.extend(day_plans)
             if coverage:
                 self.section_coverage.append({"date": frame["date"], **coverage})
-        return sorted(plans, key=lambda p: (p["day_index"], p["start"]))
+        # Assignment walks plans in (day, start, end) order; the budget pass only removes plans, so sort once here.
+        return sorted(plans, key=itemgetter("day_index", "start", "end"))
 
     def _resolve_server_targets(self, tier: str, section: str) -> Tuple[int, int]:
         server_cfg = self.pre_engine_staffing.get("servers", {})
@@ -950,15 +1189,12 @@ class ScheduleGenerator:
             return "split"
         if tier_norm == "peak":
             return "peak"
-        mode = (self.policy.get("hoh_mode") or "auto").lower()
-        combo_enabled = float(self.hoh_thresholds.get("combo_enabled_max", 0.55))
-        split_threshold = float(self.hoh_thresholds.get("split_threshold", 0.75))
-        peak_threshold = float(self.hoh_thresholds.get("peak_threshold", 1.0))
-        if mode == "peak" or demand_index >= peak_threshold:
+        mode = self.hoh_mode
+        if mode == "peak" or demand_index >= self._hoh_peak_threshold:
             return "peak"
-        if mode == "split" or demand_index >= split_threshold:
+        if mode == "split" or demand_index >= self._hoh_split_threshold:
             return "split"
-        if mode == "combo" or demand_index <= combo_enabled:
+        if mode == "combo" or demand_index <= self._hoh_combo_max:
             return "combo"
         return "balanced"
 
@@ -969,8 +1205,7 @@ class ScheduleGenerator:
         pm_start = frame["pm_start"]
         close_dt = frame["close_dt"]
         demand_index = frame.get("demand_index", 1.0)
-        combo_enabled = float(self.hoh_thresholds.get("combo_enabled_max", 0.55))
-        split_threshold = float(self.hoh_thresholds.get("split_threshold", 0.75))
+        split_threshold = self._hoh_split_threshold
         stage = self._hoh_stage(demand_index, frame.get("tier"))
         am_combo = stage in {"combo", "balanced"}
         pm_combo = stage in {"combo"} and demand_index <= split_threshold
@@ -1109,11 +1344,11 @@ class ScheduleGenerator:
     ) -> None:
         if end <= start:
             return
+        role_meta = self._role_metadata(role)
         # Normalize non-closer shift duration to <= 8h to avoid unrealistic all-day blocks.
         if (block or "").lower() != "close" and not self._is_closer_block(role, block):
-            max_span = datetime.timedelta(hours=8)
-            if end - start > max_span:
-                end = start + max_span
+            if end - start > _MAX_PLAN_SPAN:
+                end = start + _MAX_PLAN_SPAN
         plans.append(
             {
                 "role": role,
@@ -1127,7 +1362,7 @@ class ScheduleGenerator:
                 "essential": essential,
                 "cut_rank": cut_rank,
                 "note": note or "",
-                "role_group": self._canonical_group(role_group(role)),
+                "role_group": role_meta["canonical_group"],
                 "_pair_key": pair_key,
             }
         )
@@ -1379,14 +1614,7 @@ class ScheduleGenerator:
         # Server openers/closers and section staffing.
         dining_am, dining_pm = self._resolve_server_targets(tier, "dining")
         cocktail_am, cocktail_pm = self._resolve_server_targets(tier, "cocktail")
-        patio_enabled_cfg = self.policy.get("seasonal_settings", {}) if isinstance(self.policy, dict) else {}
-        patio_enabled = patio_enabled_cfg.get("server_patio_enabled")
-        if patio_enabled is None:
-            patio_role_cfg = self.roles_config.get("Server - Patio", {})
-            patio_enabled = bool(patio_role_cfg.get("enabled", False))
-        else:
-            patio_enabled = bool(patio_enabled)
-        patio_target = 1 if patio_enabled and tier != "slow" else 0
+        patio_target = 1 if self.server_patio_enabled and tier != "slow" else 0
 
         # Required server opener (open buffer -> AM, first cut).
         dining_open_pair = f"dining_opener:{day_index}"
@@ -1844,10 +2072,19 @@ class ScheduleGenerator:
                 continue
             tolerance = 1.0 + self.labor_budget_tolerance
             target_budget = budget * tolerance
-            cost = self._estimate_plan_cost(bucket)
+            # One cost column per day feeds both the day total and every trim candidate's savings.
+            plan_costs = self._plan_costs(bucket)
+            cost = round(sum(plan_costs), 2)
             if cost <= target_budget:
                 continue
-            self._trim_day_to_budget(bucket, cost, target_budget, day_index, plans)
+            self._trim_day_to_budget(
+                bucket,
+                cost,
+                target_budget,
+                day_index,
+                plans,
+                plan_costs={id(plan): plan_cost for plan, plan_cost in zip(bucket, plan_costs)},
+            )
 
     def _day_budget(self, day_index: int) -> Optional[float]:
         if 0 <= day_index < len(self.day_contexts):
@@ -1857,17 +2094,21 @@ class ScheduleGenerator:
             return sales * modifier * self.labor_budget_pct
         return None
 
-    def _estimate_plan_cost(self, bucket: List[Dict[str, Any]]) -> float:
-        total = 0.0
+    def _plan_costs(self, bucket: List[Dict[str, Any]]) -> List[float]:
+        """Unrounded labor cost of each plan, parallel to ``bucket`` (0.0 for plans without a window)."""
+        costs: List[float] = []
         for plan in bucket:
             start = plan.get("start")
             end = plan.get("end")
             if not isinstance(start, datetime.datetime) or not isinstance(end, datetime.datetime):
+                costs.append(0.0)
                 continue
             hours = max(0.0, (end - start).total_seconds() / 3600)
-            rate = self._role_wage(plan.get("role"))
-            total += hours * rate
-        return round(total, 2)
+            costs.append(hours * self._role_wage(plan.get("role")))
+        return costs
+
+    def _estimate_plan_cost(self, bucket: List[Dict[str, Any]]) -> float:
+        return round(sum(self._plan_costs(bucket)), 2)
 
     def _trim_day_to_budget(
         self,
@@ -1876,6 +2117,8 @@ class ScheduleGenerator:
         target_budget: float,
         day_index: int,
         plans_ref: Optional[List[Dict[str, Any]]] = None,
+        *,
+        plan_costs: Optional[Dict[int, float]] = None,
     ) -> None:
         candidates: List[Tuple[float, Dict[str, Any]]] = []
         section_order = {"patio": 0, "cocktail": 1, "dining": 2, "cashier": 3, "hoh": 4, "bar": 5}
@@ -1888,12 +2131,15 @@ class ScheduleGenerator:
             cut_rank = plan.get("cut_rank", 5)
             score = (section_rank, cut_rank, weight)
             candidates.append((score, plan))
-        candidates.sort(key=lambda item: item[0])
+        candidates.sort(key=itemgetter(0))
         cost = current_cost
         for _score, plan in candidates:
             if cost <= target_budget:
                 break
-            saved = self._estimate_plan_cost([plan])
+            if plan_costs is not None and id(plan) in plan_costs:
+                saved = round(plan_costs[id(plan)], 2)
+            else:
+                saved = self._estimate_plan_cost([plan])
             try:
                 bucket.remove(plan)
             except ValueError:
@@ -1921,18 +2167,11 @@ class ScheduleGenerator:
             )
 
     def _section_weight_value(self, section: Optional[str]) -> float:
-        label = (section or "").lower()
-        if label == "patio":
-            return float(self.section_weights.get("patio", 0.5))
-        if label == "cocktail":
-            return float(self.section_weights.get("cocktail", 0.7))
-        if label == "dining":
-            return float(self.section_weights.get("dining", 1.0))
-        return 1.0
+        return self._section_weight_by_label.get((section or "").lower(), 1.0)
 
     def _apply_plan_manager_fallback(self, demand: BlockDemand, payload: Dict[str, Any]) -> bool:
         """Apply a manager fallback override for a plan flagged before assignment."""
-        role_norm = normalize_role(demand.role)
+        role_norm = self._role_metadata(demand.role)["normalized"]
         # Never allow fallback for openers/closers or disallowed roles/groups.
         if "opener" in role_norm or "closer" in role_norm:
             return False
@@ -2024,7 +2263,10 @@ class ScheduleGenerator:
         assignments: List[Dict[str, Any]] = []
         self.unfilled_slots = []
         pair_map: Dict[str, Optional[int]] = {}
-        for plan in sorted(plans, key=lambda p: (p.get("day_index", 0), p.get("start"), p.get("end"))):
+        # Plans arrive sorted by (day, start, end) from _build_bww_week_plan.
+        for plan in plans:
+            role_meta = self._role_metadata(plan.get("role"))
+            group_name = plan.get("role_group") or role_meta["canonical_group"]
             demand = BlockDemand(
                 day_index=plan.get("day_index", 0),
                 date=plan.get("date"),
@@ -2038,8 +2280,9 @@ class ScheduleGenerator:
                 minimum=1,
                 allow_cuts=plan.get("allow_cut", True),
                 always_on=plan.get("essential", False),
-                role_group=plan.get("role_group") or self._canonical_group(role_group(plan.get("role"))),
+                role_group=group_name,
                 hourly_rate=self._role_wage(plan.get("role")),
+                cut_rank=self.cut_priority_rank.get(group_name, 2),
             )
             demand.recommended_cut = plan.get("end")
             pair_key = plan.get("_pair_key")
@@ -2049,10 +2292,10 @@ class ScheduleGenerator:
             else:
                 candidate = None if plan.get("force_manager_fallback") else self._select_employee(demand)
                 # Hard-stop fallback for required HOH opener: if no exact match, allow any kitchen-capable employee.
-                if not candidate and "hoh - opener" in normalize_role(demand.role):
+                if not candidate and "hoh - opener" in role_meta["normalized"]:
                     candidate = self._select_any_kitchen(demand)
             if candidate:
-                if role_group(demand.role) == "Cashier" and self._is_management_only(candidate):
+                if role_meta["group"] == "Cashier" and self._is_management_only(candidate):
                     candidate = None
                 else:
                     self._register_assignment(candidate, demand)
@@ -2083,8 +2326,7 @@ class ScheduleGenerator:
         for role_name, cfg in self.roles_config.items():
             if not isinstance(cfg, dict) or not cfg.get("enabled", True):
                 continue
-            group_name = self._role_group_name(role_name, cfg)
-            mapping[group_name].append(role_name)
+            mapping[self._role_metadata(role_name)["group_name"]].append(role_name)
         return mapping
 
     def _minimum_staff_for_group(self, group_name: str) -> int:
@@ -2092,7 +2334,7 @@ class ScheduleGenerator:
         return max(0, int(MIN_STAFF_DEFAULTS.get(canonical, MIN_STAFF_DEFAULTS.get(group_name, 1))))
 
     def _slot_sales_weights(
-        self, day_index: int, slots: List[Dict[str, Any]], notes: Dict[str, Any]
+        self, day_index: int, slots: List[Dict[str, Any]], notes: Mapping[str, Any]
     ) -> List[float]:
         """
         Estimate a time-of-day sales curve: lunch -> shoulder -> dinner -> late night.
@@ -2101,9 +2343,7 @@ class ScheduleGenerator:
         if not slots:
             return []
         span_minutes = max(1.0, (slots[-1]["end"] - slots[0]["start"]).total_seconds() / 60.0)
-        demand_index = 1.0
-        if 0 <= day_index < len(self.day_contexts):
-            demand_index = self.day_contexts[day_index].get("indices", {}).get("demand_index", 1.0)
+        demand_index = self._day_demand_index(day_index)
         dow = WEEKDAY_TOKENS[day_index]
         is_weekend = dow in {"Fri", "Sat"}
         note_text = json.dumps(notes).lower() if notes else ""
@@ -2151,6 +2391,12 @@ class ScheduleGenerator:
         return final
 
     def _role_wage(self, role_name: str) -> float:
+        wage = self._role_wage_cache.get(role_name)
+        if wage is None:
+            wage = self._role_wage_cache[role_name] = self._resolve_role_wage(role_name)
+        return wage
+
+    def _resolve_role_wage(self, role_name: str) -> float:
         if role_name in self.wage_overrides:
             try:
                 override = float(self.wage_overrides[role_name])
@@ -2183,17 +2429,11 @@ class ScheduleGenerator:
         start_dt: datetime.datetime,
         end_dt: datetime.datetime,
     ) -> Tuple[datetime.datetime, datetime.datetime]:
-        normalized_role = normalize_role(role_name)
         block_label = (block_name or "").strip().lower()
-        is_cashier = any(keyword in normalized_role for keyword in ("cashier", "takeout", "to-go"))
-        opener_keywords = ("opener",)
-        closer_keywords = ("closer",)
-        if self.open_buffer_minutes and any(keyword in normalized_role for keyword in opener_keywords):
-            buffer_minutes = self._round_minutes(max(0, self.open_buffer_minutes))
-            open_min = open_minutes(self.policy, date_value)
-            day_start = datetime.datetime.combine(date_value, datetime.time.min, tzinfo=UTC)
-            open_dt = day_start + datetime.timedelta(minutes=open_min)
-            buffered_start = open_dt - datetime.timedelta(minutes=buffer_minutes)
+        if self.open_buffer_minutes and self._role_metadata(role_name)["is_opener"]:
+            day_start = self._minutes_to_dt(date_value, 0)
+            open_dt = self._minutes_to_dt(date_value, self._open_close_minutes(date_value)[0])
+            buffered_start = open_dt - self._open_buffer_delta
             if buffered_start < day_start:
                 buffered_start = day_start
             if start_dt > buffered_start:
@@ -2212,7 +2452,16 @@ class ScheduleGenerator:
         return start_dt, end_dt
 
 
+    def _day_demand_index(self, day_index: int) -> float:
+        if 0 <= day_index < len(self._demand_index_by_day):
+            return self._demand_index_by_day[day_index]
+        if 0 <= day_index < len(self.day_contexts):
+            return self.day_contexts[day_index].get("indices", {}).get("demand_index", 1.0)
+        return 1.0
+
     def _day_sales_value(self, day_index: int) -> float:
+        if 0 <= day_index < len(self._day_sales):
+            return self._day_sales[day_index]
         if 0 <= day_index < len(self.day_contexts):
             ctx = self.day_contexts[day_index]
             sales = float(ctx.get("sales", 0.0))
@@ -2249,26 +2498,18 @@ class ScheduleGenerator:
     ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
         if block_label not in {"open", "mid", "pm"}:
             return []
-        group_name = self._canonical_group(role_group(role_name))
         block_key = "am" if block_label in {"open", "mid"} else "pm"
-        day_token = WEEKDAY_TOKENS[date_value.weekday()]
-        override = self.shift_presets.get(group_name) or self.shift_presets.get(role_name) or {}
-        templates = self.pattern_templates.get(group_name) or self.pattern_templates.get(role_name) or {}
-        day_spec = templates.get(day_token) or templates.get("default") if isinstance(templates, dict) else {}
-        if isinstance(override, dict) and block_key in override:
-            windows = override.get(block_key)
-        elif isinstance(day_spec, dict):
-            windows = day_spec.get(block_key)
-        else:
-            windows = []
+        key = (role_name, WEEKDAY_TOKENS[date_value.weekday()], block_key)
+        window_minutes = self._pattern_by_key.get(key)
+        if window_minutes is None:
+            window_minutes = self._pattern_by_key[key] = self._resolve_pattern_minutes(*key)
         parsed: List[Tuple[datetime.datetime, datetime.datetime]] = []
-        if not isinstance(windows, list):
+        if not window_minutes:
             return parsed
-        for window in windows:
-            parsed_window = self._parse_pattern_window(date_value, window)
-            if not parsed_window:
-                continue
-            start_dt, end_dt = parsed_window
+        for start_minutes, end_minutes in window_minutes:
+            start_dt = self._minutes_to_dt(date_value, start_minutes)
+            end_dt = self._minutes_to_dt(date_value, end_minutes)
+            parsed_window = (start_dt, end_dt)
             if anchor_start:
                 duration = end_dt - start_dt
                 if duration.total_seconds() <= 0:
@@ -2283,6 +2524,33 @@ class ScheduleGenerator:
             parsed.append(parsed_window)
         return parsed
 
+    def _resolve_pattern_minutes(self, role_name: str, day_token: str, block_key: str) -> Tuple[Tuple[int, int], ...]:
+        """Resolve a role's preset or template windows for a weekday/period to minute offsets."""
+        group_name = self._role_metadata(role_name)["canonical_group"]
+        override = self.shift_presets.get(group_name) or self.shift_presets.get(role_name) or {}
+        templates = self.pattern_templates.get(group_name) or self.pattern_templates.get(role_name) or {}
+        day_spec = templates.get(day_token) or templates.get("default") if isinstance(templates, dict) else {}
+        if isinstance(override, dict) and block_key in override:
+            windows = override.get(block_key)
+        elif isinstance(day_spec, dict):
+            windows = day_spec.get(block_key)
+        else:
+            windows = []
+        if not isinstance(windows, list):
+            return ()
+        resolved: List[Tuple[int, int]] = []
+        for window in windows:
+            if not isinstance(window, dict):
+                continue
+            start_label = window.get("start")
+            end_label = window.get("end")
+            start_minutes = _label_minutes(str(start_label)) if start_label is not None else None
+            end_minutes = _label_minutes(str(end_label)) if end_label is not None else None
+            if start_minutes is None or end_minutes is None:
+                continue
+            resolved.append((start_minutes, end_minutes))
+        return tuple(resolved)
+
     def _window_subset_for_slots(
         self, windows: List[Tuple[datetime.datetime, datetime.datetime]], slots: int, day_index: int
     ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
@@ -2332,21 +2600,13 @@ class ScheduleGenerator:
             adjusted.append((new_start, new_end))
         return adjusted
 
-    def _parse_pattern_window(
-        self, date_value: datetime.date, window: Dict[str, Any]
-    ) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
-        if not isinstance(window, dict):
-            return None
-        start_label = window.get("start")
-        end_label = window.get("end")
-        start_minutes = parse_time_label(str(start_label)) if start_label is not None else None
-        end_minutes = parse_time_label(str(end_label)) if end_label is not None else None
-        if start_minutes is None or end_minutes is None:
-            return None
-        base = datetime.datetime.combine(date_value, datetime.time.min, tzinfo=UTC)
-        start_dt = base + datetime.timedelta(minutes=int(start_minutes))
-        end_dt = base + datetime.timedelta(minutes=int(end_minutes))
-        return start_dt, end_dt
+    def _daily_boost_vector(self, role_name: str, role_cfg: Dict[str, Any]) -> Tuple[int, ...]:
+        """Resolve a role's weekday-token boosts into a 7-slot tuple indexed by day, once per role."""
+        boosts = self._daily_boosts.get(role_name)
+        if boosts is None:
+            raw = role_cfg.get("daily_boost", {}) or {}
+            boosts = self._daily_boosts[role_name] = tuple(int(raw.get(token, 0)) for token in WEEKDAY_TOKENS)
+        return boosts
 
     def _calculate_block_need(
         self,
@@ -2365,21 +2625,24 @@ class ScheduleGenerator:
         max_staff = max(int(block_cfg.get("max", max(base, min_staff))), min_staff)
         per_sales = float(block_cfg.get("per_1000_sales", 0.0))
         per_modifier = float(block_cfg.get("per_modifier", 0.0))
-        sales = self._day_sales_value(day_index)
-        sales_component = int(math.floor((sales / 1000.0) * per_sales))
-        modifier_component = int(round(len(self.modifiers_by_day.get(day_index, [])) * per_modifier))
-        boosts = role_cfg.get("daily_boost", {}) or {}
-        day_token = WEEKDAY_TOKENS[day_index]
-        daily_boost = int(boosts.get(day_token, 0))
+        # Sales and modifier counts are per-day tuples filled by _build_day_contexts.
+        if 0 <= day_index < len(self._day_sales) and day_index < len(self._modifier_counts):
+            sales = self._day_sales[day_index]
+            modifier_count = self._modifier_counts[day_index]
+        else:
+            sales = self._day_sales_value(day_index)
+            modifier_count = len(self.modifiers_by_day[day_index]) if 0 <= day_index < 7 else 0
+        # math.floor already returns an int; it is kept over int() so negative rates still round down.
+        sales_component = math.floor((sales / 1000.0) * per_sales)
+        modifier_component = int(round(modifier_count * per_modifier))
+        daily_boost = self._daily_boost_vector(role_name, role_cfg)[day_index]
         need = base + sales_component + modifier_component + daily_boost
         need += self._threshold_adjustment(role_cfg, block_cfg, day_index)
         if block_label == "open":
             if not self._role_allows_open_shift(role_name):
                 return 0, 0, 0
             need = 1 if need > 0 else 0
-        demand_index = 1.0
-        if 0 <= day_index < len(self.day_contexts):
-            demand_index = self.day_contexts[day_index].get("indices", {}).get("demand_index", 1.0)
+        demand_index = self._day_demand_index(day_index)
         if not role_cfg.get("critical") and not always_on and block_label in {"mid", "pm"}:
             if demand_index < 0.3:
                 need = min(need, min_staff)
@@ -2452,47 +2715,45 @@ class ScheduleGenerator:
             budget = payload.get("budget")
             if budget is None or budget <= 0:
                 continue
-            total_cost = sum(self._slot_cost(demand) * demand.need for demand in payload["demands"])
-            locked_cost = sum(self._locked_slot_cost(demand) for demand in payload["demands"])
+            bucket_demands = payload["demands"]
+            # Anchor status is fixed for the pass; resolve it once per demand.
+            anchors = [self._is_anchor_demand(demand) for demand in bucket_demands]
+            total_cost = 0.0
+            locked_cost = 0.0
+            for demand, is_anchor in zip(bucket_demands, anchors):
+                slot_cost = demand.slot_cost
+                total_cost += slot_cost * demand.need
+                if slot_cost > 0 and (not demand.allow_cuts or is_anchor or demand.always_on):
+                    locked_cost += slot_cost * max(0, demand.need)
             base_budget = max(budget, locked_cost)
             allowed_max = max(budget * (1 + self.labor_budget_tolerance), locked_cost)
             if total_cost <= allowed_max + 1e-6:
                 continue
             soft_mode = (total_cost / base_budget) <= (1.0 + self.labor_budget_tolerance + 1e-6)
-            demand_index = 1.0
-            if 0 <= day_index < len(self.day_contexts):
-                demand_index = self.day_contexts[day_index].get("indices", {}).get("demand_index", 1.0)
-            for demand in payload["demands"]:
-                if demand.allow_cuts and not self._is_anchor_demand(demand):
+            for demand, is_anchor in zip(bucket_demands, anchors):
+                if demand.allow_cuts and not is_anchor:
                     demand.minimum = min(demand.minimum, 0)
             adjustable_budget = max(0.0, allowed_max - locked_cost)
             if adjustable_budget <= 0:
                 continue
+            # One entry per demand with its removable slot count; walking them in order trims the same
+            # slots as a per-slot expanded list would, since a demand's slots were adjacent there.
             removable: List[Tuple[float, float, BlockDemand]] = []
-            for demand in payload["demands"]:
-                if not demand.allow_cuts or demand.need <= demand.minimum:
-                    continue
-                slots = demand.need - demand.minimum
-                if slots <= 0:
-                    continue
-                if self._is_anchor_demand(demand):
+            for demand, is_anchor in zip(bucket_demands, anchors):
+                if not demand.allow_cuts or demand.need <= demand.minimum or is_anchor:
                     continue
                 if soft_mode and demand.priority >= 1.0:
                     continue
-                slot_cost = self._slot_cost(demand)
-                removable.extend([(slot_cost, demand.priority, demand)] * slots)
-            removable.sort(key=lambda entry: (entry[1], -entry[0]))
-            idx = 0
-            while total_cost > allowed_max + 0.01 and idx < len(removable):
-                slot_cost, _priority, demand = removable[idx]
-                if demand.need <= demand.minimum:
-                    idx += 1
-                    continue
-                demand.need -= 1
-                total_cost -= slot_cost
-                if "trimmed by budget" not in demand.labels:
-                    demand.labels.append("trimmed by budget")
-                idx += 1
+                removable.append((demand.priority, -demand.slot_cost, demand))
+            removable.sort(key=itemgetter(0, 1))
+            for _priority, neg_cost, demand in removable:
+                if total_cost <= allowed_max + 0.01:
+                    break
+                while demand.need > demand.minimum and total_cost > allowed_max + 0.01:
+                    demand.need -= 1
+                    total_cost += neg_cost
+                    if "trimmed by budget" not in demand.labels:
+                        demand.labels.append("trimmed by budget")
             if total_cost > allowed_max + 0.01:
                 overage = max(0.0, total_cost - allowed_max)
                 self.warnings.append(
@@ -2521,7 +2782,7 @@ class ScheduleGenerator:
             allowed_min = budget * max(0.0, 1.0 - tolerance)
             if allowed_min <= 0:
                 continue
-            current_cost = sum(self._slot_cost(demand) * demand.need for demand in payload["demands"])
+            current_cost = sum(demand.slot_cost * demand.need for demand in payload["demands"])
             if current_cost >= allowed_min - 0.5:
                 continue
             allowed_max = budget * (1.0 + tolerance)
@@ -2530,55 +2791,36 @@ class ScheduleGenerator:
                 for demand in payload["demands"]
                 if demand.allow_cuts
                 and getattr(demand, "max_capacity", demand.need) > demand.need
-                and self._slot_cost(demand) > 0
+                and demand.slot_cost > 0
             ]
             if not expandable:
                 continue
             expandable.sort(key=self._budget_boost_rank)
             needed_extra = allowed_min - current_cost
-            iterations = 0
-            while needed_extra > 5.0 and expandable:
-                progress = False
-                for demand in list(expandable):
-                    capacity = getattr(demand, "max_capacity", demand.need)
-                    slack = max(0, capacity - demand.need)
-                    if slack <= 0:
-                        expandable.remove(demand)
-                        continue
-                    slot_cost = self._slot_cost(demand)
-                    if slot_cost <= 0:
-                        expandable.remove(demand)
-                        continue
-                    if current_cost + slot_cost > allowed_max + 0.5:
-                        continue
-                    demand.need += 1
-                    demand.minimum = min(demand.need, demand.minimum + 1)
-                    demand.allow_cuts = False
-                    current_cost += slot_cost
-                    needed_extra = max(0.0, allowed_min - current_cost)
-                    if "budget boost" not in demand.labels:
-                        demand.labels.append("budget boost")
-                    progress = True
-                    break
-                if not progress:
-                    break
-                iterations += 1
-                if iterations >= 500:
-                    break
+            # current_cost only grows and slot costs are fixed, so a demand that is full or too expensive
+            # stays skipped; one forward cursor visits demands in the order a rescan from the top would.
+            boosts = 0
+            cursor = 0
+            while needed_extra > 5.0 and cursor < len(expandable) and boosts < 500:
+                demand = expandable[cursor]
+                capacity = getattr(demand, "max_capacity", demand.need)
+                slot_cost = demand.slot_cost
+                if capacity <= demand.need or slot_cost <= 0 or current_cost + slot_cost > allowed_max + 0.5:
+                    cursor += 1
+                    continue
+                demand.need += 1
+                demand.minimum = min(demand.need, demand.minimum + 1)
+                demand.allow_cuts = False
+                current_cost += slot_cost
+                needed_extra = max(0.0, allowed_min - current_cost)
+                if "budget boost" not in demand.labels:
+                    demand.labels.append("budget boost")
+                boosts += 1
 
     def _budget_boost_rank(self, demand: BlockDemand) -> Tuple[int, float, float]:
         block_label = demand.block_name.strip().lower()
         block_order = {"pm": 0, "mid": 1, "open": 2, "close": 3}.get(block_label, 4)
-        return (block_order, -demand.priority, -self._slot_cost(demand))
-
-    def _locked_slot_cost(self, demand: BlockDemand) -> float:
-        slot_cost = self._slot_cost(demand)
-        if slot_cost <= 0:
-            return 0.0
-        locked_units = 0
-        if not demand.allow_cuts or self._is_anchor_demand(demand) or demand.always_on:
-            locked_units = max(demand.need, locked_units)
-        return slot_cost * max(0, locked_units)
+        return (block_order, -demand.priority, -demand.slot_cost)
 
     def _rebalance_budget_targets(self, demands: List[BlockDemand]) -> None:
         """Nudge cut windows so total cost better matches the configured budget."""
@@ -2645,7 +2887,7 @@ class ScheduleGenerator:
     def _shrink_demands_for_budget(self, bucket: List[BlockDemand], dollars_to_trim: float) -> None:
         if dollars_to_trim <= 1.0 or not bucket:
             return
-        ordered = sorted(bucket, key=lambda d: (d.start, d.priority))
+        ordered = sorted(bucket, key=attrgetter("start", "priority"))
         for demand in ordered:
             if dollars_to_trim <= 0.5:
                 break
@@ -2702,7 +2944,11 @@ class ScheduleGenerator:
     ) -> int:
         if not employee:
             return default_start
-        assignments = employee["assignments"].get(day_index, [])
+        earliest_by_day = employee.get("day_earliest_start")
+        if earliest_by_day is not None:
+            earliest = earliest_by_day[day_index]
+            return default_start if earliest is None else earliest
+        assignments = employee["assignments"][day_index]
         if not assignments:
             return default_start
         return min(start for start, _ in assignments)
@@ -2714,13 +2960,15 @@ class ScheduleGenerator:
         demand: BlockDemand,
         start_minutes: int,
     ) -> Tuple[List[Dict[str, Any]], bool]:
-        ordering: List[Tuple[int, datetime.datetime, bool, int]] = []
+        # Compare planned ends as minutes past the block start rather than datetime + timedelta.
+        block_start = demand.start
+        ordering: List[Tuple[int, float, bool, int]] = []
         for idx, (payload, employee) in enumerate(entries):
             earliest = self._entry_start_rank(employee, demand.day_index, start_minutes)
             locked = bool(payload.get("_followup_locked"))
-            ordering.append((earliest, planned_end_times[idx], locked, idx))
-        ordering.sort(key=lambda item: item[0])
-        tolerance = datetime.timedelta(minutes=self._fifo_tolerance_minutes())
+            ordering.append((earliest, (planned_end_times[idx] - block_start) / ONE_MINUTE, locked, idx))
+        ordering.sort(key=itemgetter(0))
+        tolerance = self._fifo_tolerance_minutes()
         violations: List[Dict[str, Any]] = []
         locked_only = True
         for first, second in zip(ordering, ordering[1:]):
@@ -2776,7 +3024,7 @@ class ScheduleGenerator:
         return changed
 
     def _fifo_tolerance_minutes(self) -> int:
-        return max(5, self.round_to_minutes)
+        return self._tolerance_5
 
     def _force_fifo_adjustments(
         self,
@@ -2846,17 +3094,15 @@ class ScheduleGenerator:
             self.group_pressure = pressure
             return
         cost_totals: Dict[Tuple[int, str], float] = {}
-        budget_totals: Dict[Tuple[int, str], float] = {}
         for demand in demands:
-            if demand.need <= 0:
+            need = demand.need
+            if need <= 0:
                 continue
             key = (demand.day_index, demand.role_group)
-            cost_totals[key] = cost_totals.get(key, 0.0) + (self._slot_cost(demand) * demand.need)
-            budget = self._group_budget_for_day(demand.day_index, demand.role_group)
-            if budget is not None:
-                budget_totals[key] = budget
+            cost_totals[key] = cost_totals.get(key, 0.0) + demand.slot_cost * need
+        # The budget depends only on the (day, group) key, so it is looked up once per key.
         for (day_idx, group_name), cost_value in cost_totals.items():
-            budget = budget_totals.get((day_idx, group_name), 0.0)
+            budget = self._group_budget_for_day(day_idx, group_name) or 0.0
             ratio = cost_value / budget if budget > 0 else 1.0
             day_map = pressure.setdefault(day_idx, {})
             day_map[group_name] = round(max(0.0, ratio), 3)
@@ -2932,17 +3178,21 @@ class ScheduleGenerator:
     ) -> List[BlockDemand]:
         if not candidates or target_count <= 0:
             return []
-        normalized_preferences = [normalize_role(role) for role in preferred_roles]
+        preference_index: Dict[str, int] = {}
+        for index, role in enumerate(preferred_roles):
+            preference_index.setdefault(normalize_role(role), index)
+        unranked = len(preferred_roles)
+        # Candidates share a handful of role names; resolve each name's rank once.
+        rank_by_role: Dict[str, int] = {}
 
         def rank(demand: BlockDemand) -> Tuple[int, float]:
-            normalized = normalize_role(demand.role)
-            try:
-                preferred_index = normalized_preferences.index(normalized)
-            except ValueError:
-                preferred_index = len(normalized_preferences)
-            return (preferred_index, -demand.priority)
+            role_rank = rank_by_role.get(demand.role)
+            if role_rank is None:
+                role_rank = rank_by_role[demand.role] = preference_index.get(normalize_role(demand.role), unranked)
+            return (role_rank, -demand.priority)
 
-        return sorted(candidates, key=rank)[:target_count]
+        # Only the first target_count are kept; nsmallest is the stable sorted(...)[:n] without a full sort.
+        return heapq.nsmallest(target_count, candidates, key=rank)
 
     @staticmethod
     def _dedupe_anchor_assignments(day_demands: List[BlockDemand], block_label: str) -> None:
@@ -2997,7 +3247,7 @@ class ScheduleGenerator:
 
     def _role_preference_rank(self, demand: BlockDemand) -> int:
         preferences = self._role_cut_preferences(demand.role_group)
-        normalized = normalize_role(demand.role)
+        normalized = self._role_metadata(demand.role)["normalized"]
         try:
             return preferences.index(normalized)
         except ValueError:
@@ -3018,12 +3268,10 @@ class ScheduleGenerator:
         day_idx = demand.day_index
         pressure_ratio = self.group_pressure.get(day_idx, {}).get(demand.role_group, 1.0)
         budget_component = max(0.0, pressure_ratio - 1.0)
-        demand_index = 1.0
-        if 0 <= day_idx < len(self.day_contexts):
-            demand_index = self.day_contexts[day_idx].get("indices", {}).get("demand_index", 1.0)
+        demand_index = self._day_demand_index(day_idx)
         workload_component = max(0.0, demand_index - 0.5)
         peak_component = max(0.0, self._block_progress_fraction(demand) - 0.6)
-        base_rank = self.cut_priority_rank.get(demand.role_group, 2)
+        base_rank = self._demand_cut_rank(demand)
         score = (budget_component * 2.0) + (peak_component * 1.4) + (workload_component * 0.6) - (base_rank * 0.05)
         capacity_weight = self._section_capacity_weight(demand)
         demand.cut_factors = {
@@ -3044,7 +3292,7 @@ class ScheduleGenerator:
             return 1.0
         total = max(1.0, (demand.end - demand.start).total_seconds())
         progressed = max(0.0, (demand.recommended_cut - demand.start).total_seconds())
-        return self._clamp(progressed / total, 0.0, 1.0)
+        return _clamp(progressed / total, 0.0, 1.0)
 
     @staticmethod
     def _stagger_step_for_pressure(pressure: float) -> int:
@@ -3106,7 +3354,7 @@ class ScheduleGenerator:
         for day_idx, bucket in by_day.items():
             if not bucket:
                 continue
-            bucket.sort(key=lambda d: self._cut_sort_key(d))
+            bucket.sort(key=self._cut_sort_key)
             group_offsets: Dict[str, int] = defaultdict(int)
             for demand in bucket:
                 group = demand.role_group
@@ -3130,6 +3378,7 @@ class ScheduleGenerator:
                     )
 
     def _recommend_cut_time(self, demand: BlockDemand) -> Optional[datetime.datetime]:
+        role_meta = self._role_metadata(demand.role)
         if self._is_closer_block(demand.role, demand.block_name):
             return None
         if demand.block_name.strip().lower() == "open":
@@ -3144,21 +3393,19 @@ class ScheduleGenerator:
         except (TypeError, ValueError):
             buffer_minutes = 30
 
-        demand_index = 1.0
-        if 0 <= demand.day_index < len(self.day_contexts):
-            demand_index = self.day_contexts[demand.day_index].get("indices", {}).get("demand_index", 1.0)
+        demand_index = self._day_demand_index(demand.day_index)
 
         pressure_ratio = self.group_pressure.get(demand.day_index, {}).get(demand.role_group, 1.0)
-        priority_rank = self.cut_priority_rank.get(demand.role_group, 2)
+        priority_rank = self._demand_cut_rank(demand)
         min_hours, max_hours = shift_length_limits(self.policy, demand.role, demand.role_group)
-        # Allow faster releases than the nominal minimum when trimming: 1.5h floor for non-closers.
-        if not self._is_closer_block(demand.role, demand.block_name):
-            min_hours = min(min_hours, 1.5)
+        # Allow faster releases than the nominal minimum when trimming: 1.5h floor for non-closers
+        # (closer blocks already returned above).
+        min_hours = min(min_hours, 1.5)
 
-        normalized_role = normalize_role(demand.role)
+        normalized_role = role_meta["normalized"]
         demand_softness = max(0.0, 1.0 - demand_index)  # softer = closer to 1
         pressure_factor = max(0.0, pressure_ratio - 1.0)
-        cashier_bias = 1.0 if ("cashier" in normalized_role or "takeout" in normalized_role or "to-go" in normalized_role) else 0.0
+        cashier_bias = 1.0 if role_meta["is_cashier"] else 0.0
 
         group_bias = 0
         if group_name in {"Cashier"}:
@@ -3236,12 +3483,15 @@ class ScheduleGenerator:
 
     @staticmethod
     def _slot_cost(demand: BlockDemand) -> float:
-        return max(0.0, demand.duration_hours * max(0.0, demand.hourly_rate or 0.0))
+        return demand.slot_cost
 
     @staticmethod
     def _compute_cost(start: datetime.datetime, end: datetime.datetime, rate: float) -> float:
-        hours = max(0.0, (end - start).total_seconds() / 3600)
-        return round(hours * max(0.0, rate or 0.0), 2)
+        return ScheduleGenerator._minutes_cost((end - start) / ONE_MINUTE, rate)
+
+    @staticmethod
+    def _minutes_cost(minutes: float, rate: float) -> float:
+        return round(max(0.0, minutes) / 60 * max(0.0, rate or 0.0), 2)
 
     def _day_label(self, day_index: int) -> str:
         if 0 <= day_index < len(self.day_contexts):
@@ -3249,16 +3499,12 @@ class ScheduleGenerator:
         return f"Day {day_index + 1}"
 
     def _is_opener_block(self, role_name: str, block_name: str) -> bool:
-        normalized_role = normalize_role(role_name)
-        block_label = (block_name or "").strip().lower()
-        if block_label == "open":
+        if (block_name or "").strip().lower() == "open":
             return True
-        if not normalized_role:
-            return False
-        return "opener" in normalized_role
+        return self._role_metadata(role_name)["is_opener"]
 
     def _role_allows_open_shift(self, role_name: str) -> bool:
-        normalized_role = normalize_role(role_name)
+        normalized_role = self._role_metadata(role_name)["normalized"]
         if not normalized_role:
             return False
         if "opener" in normalized_role:
@@ -3279,13 +3525,10 @@ class ScheduleGenerator:
         return normalized_role in allowed
 
     def _is_closer_block(self, role_name: str, block_name: str) -> bool:
-        normalized_role = normalize_role(role_name)
-        if not normalized_role:
-            return False
-        return "closer" in normalized_role and block_name.strip().lower() == "close"
+        return self._role_metadata(role_name)["is_closer"] and block_name.strip().lower() == "close"
 
     def _is_anchor_demand(self, demand: BlockDemand) -> bool:
-        normalized_role = normalize_role(demand.role)
+        normalized_role = self._role_metadata(demand.role)["normalized"]
         role_cfg = role_definition(self.policy, demand.role)
         return (
             normalized_role in self.non_cuttable_roles
@@ -3296,18 +3539,19 @@ class ScheduleGenerator:
             or bool(role_cfg.get("critical"))
         )
 
-    def _demand_window_minutes(self, demand: BlockDemand) -> Tuple[int, int]:
-        start_delta_days = (demand.start.date() - demand.date).days
-        end_delta_days = (demand.end.date() - demand.date).days
-        start_minutes = demand.start.hour * 60 + demand.start.minute + start_delta_days * 24 * 60
-        end_minutes = demand.end.hour * 60 + demand.end.minute + end_delta_days * 24 * 60
-        if end_minutes < start_minutes:
-            end_minutes = start_minutes
-        return start_minutes, end_minutes
-
-    def _demand_day_segments(self, demand: BlockDemand) -> List[Tuple[int, int, int]]:
+    @staticmethod
+    def _demand_window_minutes(demand: BlockDemand) -> Tuple[int, int]:
+        window = demand.window_minutes
+        if window is None:
+            window = demand.window_minutes = _window_minutes(demand.date, demand.start, demand.end)
+        return window
+
+    def _demand_day_segments(self, demand: BlockDemand) -> Tuple[Tuple[int, int, int, int], ...]:
+        """Per-day (offset, start, end, minute mask) pieces of the demand, cached on the demand."""
+        if demand.day_segments is not None:
+            return demand.day_segments
         start_minutes, end_minutes = self._demand_window_minutes(demand)
-        segments: List[Tuple[int, int, int]] = []
+        segments: List[Tuple[int, int, int, int]] = []
         cursor = start_minutes
         minutes_per_day = 24 * 60
         while cursor < end_minutes:
@@ -3315,15 +3559,19 @@ class ScheduleGenerator:
             day_start = day_offset * minutes_per_day
             day_end = day_start + minutes_per_day
             segment_end = min(end_minutes, day_end)
+            seg_start = int(cursor - day_start)
+            seg_end = int(segment_end - day_start)
             segments.append(
                 (
                     int(day_offset),
-                    int(cursor - day_start),
-                    int(segment_end - day_start),
+                    seg_start,
+                    seg_end,
+                    ((1 << (seg_end - seg_start)) - 1) << seg_start,
                 )
             )
             cursor = segment_end
-        return segments or [(0, 0, 0)]
+        demand.day_segments = tuple(segments) or ((0, 0, 0, 0),)
+        return demand.day_segments
 
     def _threshold_adjustment(self, role_cfg: Dict[str, Any], block_cfg: Dict[str, Any], day_index: int) -> int:
         thresholds = []
@@ -3346,13 +3594,13 @@ class ScheduleGenerator:
             value = indices.get(metric)
             if value is None:
                 continue
-            gte = self._to_float(rule.get("gte"), default=0.0)
+            gte = _to_float(rule.get("gte"), default=0.0)
             lte = rule.get("lte")
             if value < gte:
                 continue
-            if lte is not None and value > self._to_float(lte, default=value):
+            if lte is not None and value > _to_float(lte, default=value):
                 continue
-            add = self._to_int(rule.get("add"), default=0)
+            add = _to_int(rule.get("add"), default=0)
             adjustment += add
         return adjustment
 
@@ -3447,8 +3695,9 @@ class ScheduleGenerator:
                 ctx_date = self.day_contexts[day_index].get("date")
             if ctx_date:
                 day_start = datetime.datetime.combine(ctx_date, datetime.time.min, tzinfo=UTC)
-                open_dt = day_start + datetime.timedelta(minutes=open_minutes(self.policy, ctx_date))
-                close_dt = day_start + datetime.timedelta(minutes=close_minutes(self.policy, ctx_date))
+                open_min, close_min = self._open_close_minutes(ctx_date)
+                open_dt = day_start + datetime.timedelta(minutes=open_min)
+                close_dt = day_start + datetime.timedelta(minutes=close_min)
         start_dt, end_dt = self._window_for_required_role(role_label, open_dt, close_dt)
         slot_indices = self._slot_indices_for_range(slots, start_dt, end_dt) if slots else []
         return start_dt, end_dt, slot_indices, group_name
@@ -3481,7 +3730,7 @@ class ScheduleGenerator:
         return self._snap_datetime(start_dt), self._snap_datetime(end_dt)
 
     def _plan_coverage(self, plans: List[Dict[str, Any]], slots: List[Dict[str, Any]], group_name: str) -> List[int]:
-        coverage = [0 for _ in slots]
+        coverage = [0] * len(slots)
         for plan in plans:
             if plan.get("role_group") != group_name:
                 continue
@@ -3584,17 +3833,16 @@ class ScheduleGenerator:
         candidates = [t for t in templates if t["start"] <= peak_start] or templates
         if not candidates:
             return None
-        template = max(candidates, key=lambda t: t["start"])
+        template = max(candidates, key=itemgetter("start"))
         start_dt = self._snap_datetime(template["start"])
-        nudge_step = datetime.timedelta(minutes=max(15, self.round_to_minutes))
         if used_starts and start_dt in used_starts and max(remaining) <= 1:
-            start_dt = self._snap_datetime(start_dt + nudge_step)
+            start_dt = self._snap_datetime(start_dt + self._nudge_step)
         slot_start = slots[0]["start"]
         slot_count = len(slots)
-        start_idx = int(max(0, (start_dt - slot_start).total_seconds() // HALF_HOUR.total_seconds()))
+        start_idx = int(max(0, (start_dt - slot_start).total_seconds() // HALF_HOUR_SECONDS))
         start_idx = min(start_idx, slot_count - 1)
-        min_slots = int(math.ceil(MIN_SHIFT_HOURS * 60 / 30))
-        max_slots = int(math.floor(MAX_SHIFT_HOURS * 60 / 30))
+        min_slots = MIN_SHIFT_SLOTS
+        max_slots = MAX_SHIFT_SLOTS
         base_slots = int(round(max(1.0, float(template.get("hours", MIN_SHIFT_HOURS))) * 60 / 30))
         window_start = start_idx
         window_end = min(slot_count, start_idx + base_slots)
@@ -3644,7 +3892,16 @@ class ScheduleGenerator:
 
     @staticmethod
     def _apply_plan_to_remaining(plan: Dict[str, Any], remaining: List[int], slots: List[Dict[str, Any]]) -> None:
-        for idx in plan.get("slot_indices", []):
+        indices = plan.get("slot_indices") or []
+        if not indices:
+            return
+        lo, hi = indices[0], indices[-1] + 1
+        if hi - lo == len(indices) and indices == list(range(lo, hi)):
+            # Plans cover a contiguous window, so decrement the whole slice in one pass.
+            lo, hi = max(0, lo), min(len(remaining), hi)
+            remaining[lo:hi] = [value - 1 if value > 0 else 0 for value in remaining[lo:hi]]
+            return
+        for idx in indices:
             if 0 <= idx < len(remaining):
                 remaining[idx] = max(0, remaining[idx] - 1)
 
@@ -3665,7 +3922,7 @@ class ScheduleGenerator:
             if not start_dt or (close_dt and start_dt >= close_dt):
                 continue
             templates.append({"style": spec.get("style", "Mid"), "start": start_dt, "hours": base_hours})
-        return sorted(templates, key=lambda item: item["start"])
+        return sorted(templates, key=itemgetter("start"))
 
     def _resolve_template_start(
         self, time_spec: Any, open_dt: Optional[datetime.datetime], close_dt: Optional[datetime.datetime]
@@ -3702,10 +3959,12 @@ class ScheduleGenerator:
 
     def _snap_datetime(self, dt_value: datetime.datetime) -> datetime.datetime:
         """Snap to nearest configured minute step to avoid non-template odd starts."""
-        base = datetime.datetime.combine(dt_value.date(), datetime.time.min, tzinfo=dt_value.tzinfo)
-        minutes = int((dt_value - base).total_seconds() // 60)
+        minutes = dt_value.hour * 60 + dt_value.minute
         rounded = self._round_minutes(minutes)
-        return base + datetime.timedelta(minutes=rounded)
+        if rounded == minutes and not dt_value.second and not dt_value.microsecond:
+            return dt_value
+        base = _COMBINE(dt_value.date(), _TIME_MIN, tzinfo=dt_value.tzinfo)
+        return base + _TIMEDELTA(minutes=rounded)
 
     def _map_plans_to_roles(
         self, plans: List[Dict[str, Any]], roles_by_group: Dict[str, List[str]]
@@ -3737,7 +3996,7 @@ class ScheduleGenerator:
                     role = self._role_for_group_default(group_name, roles)
                     is_essential = False
                 mapped.append({**plan, "role": role, "essential": is_essential, "role_group": canonical_group})
-        return sorted(mapped, key=lambda p: (p["day_index"], p["start"], p["end"]))
+        return sorted(mapped, key=itemgetter("day_index", "start", "end"))
 
     def _role_for_server_plan(
         self, idx: int, total: int, roles: List[str], plan: Dict[str, Any]
@@ -3754,9 +4013,7 @@ class ScheduleGenerator:
     def _role_for_kitchen_plan(self, idx: int, roles: List[str], plan: Dict[str, Any]) -> Tuple[str, bool]:
         expo_roles = [r for r in roles if "expo" in r.lower() or "expeditor" in r.lower()]
         day_index = plan.get("day_index", 0)
-        demand_index = 1.0
-        if 0 <= day_index < len(self.day_contexts):
-            demand_index = self.day_contexts[day_index].get("indices", {}).get("demand_index", 1.0)
+        demand_index = self._day_demand_index(day_index)
         hoh_cfg = self.pre_engine_staffing.get("hoh", {})
         thresholds = hoh_cfg.get("combo_thresholds", {})
         low_max = float(thresholds.get("low_max", 0.55) or 0.55)
@@ -3818,6 +4075,7 @@ class ScheduleGenerator:
                 always_on=plan.get("essential", False),
                 role_group=plan["role_group"],
                 hourly_rate=self._role_wage(plan["role"]),
+                cut_rank=self.cut_priority_rank.get(plan["role_group"], 2),
             )
             demand.recommended_cut = plan["end"]
             candidate = self._select_employee(demand)
@@ -3859,6 +4117,9 @@ class ScheduleGenerator:
         coverage = self._build_coverage(assignments, matrix)
         cut_order: Dict[Tuple[int, str], int] = defaultdict(int)
         tolerance = 1
+        by_group: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for shift in assignments:
+            by_group[self._shift_group(shift)].append(shift)
         for (day_index, group_name), payload in sorted(matrix.items()):
             slots = payload.get("slots", [])
             if not slots:
@@ -3870,10 +4131,11 @@ class ScheduleGenerator:
                 continue
             open_dt = payload.get("open")
             close_dt = payload.get("close")
-            current_cost = self._group_cost(assignments, group_name, open_dt, close_dt)
+            bucket = by_group.get(group_name, [])
+            current_cost = self._group_cost(bucket, group_name, open_dt, close_dt)
             if current_cost <= budget:
                 continue
-            candidates = self._cut_candidates(assignments, group_name, open_dt, close_dt)
+            candidates = self._cut_candidates(bucket, group_name, open_dt, close_dt)
             for shift in candidates:
                 if current_cost <= budget:
                     break
@@ -3894,7 +4156,7 @@ class ScheduleGenerator:
                                 "minutes_trimmed": trim_minutes,
                             }
                         )
-                        current_cost -= max(0.0, shift.get("labor_cost", 0.0) - new_cost)
+                        current_cost -= max(0.0, shift["labor_cost"] - new_cost)
                         shift["labor_cost"] = new_cost
                         break
             coverage[(day_index, group_name)] = coverage.get((day_index, group_name), [])
@@ -3905,20 +4167,27 @@ class ScheduleGenerator:
     ) -> float:
         total = 0.0
         for shift in assignments:
-            shift_group = shift.get("_role_group") or self._canonical_group(role_group(shift.get("role")))
+            shift_group = self._shift_group(shift)
             if shift_group != group_name:
                 continue
             if not self._overlaps_window(shift, open_dt, close_dt):
                 continue
-            total += float(shift.get("labor_cost", 0.0) or 0.0)
+            total += shift["labor_cost"]
         return total
 
+    def _shift_group(self, shift: Dict[str, Any]) -> str:
+        group = shift.get("_role_group_canon")
+        if group is None:
+            group = shift.get("_role_group") or self._canonical_group(role_group(shift.get("role")))
+            shift["_role_group_canon"] = group
+        return group
+
     def _cut_candidates(
         self, assignments: List[Dict[str, Any]], group_name: str, open_dt: Optional[datetime.datetime], close_dt: Optional[datetime.datetime]
     ) -> List[Dict[str, Any]]:
         candidates: List[Dict[str, Any]] = []
         for shift in assignments:
-            shift_group = shift.get("_role_group") or self._canonical_group(role_group(shift.get("role")))
+            shift_group = self._shift_group(shift)
             if shift_group != group_name or shift.get("_essential"):
                 continue
             if not self._overlaps_window(shift, open_dt, close_dt):
@@ -3929,7 +4198,7 @@ class ScheduleGenerator:
     def _cut_sort_key_simple(self, shift: Dict[str, Any]) -> Tuple[Any, ...]:
         style = shift.get("_style", "Mid")
         role_label = (shift.get("role") or "").lower()
-        group_label = shift.get("_role_group") or self._canonical_group(role_group(shift.get("role")))
+        group_label = self._shift_group(shift)
         if group_label == "Kitchen":
             hoh_order = [normalize_role(name) for name in self.pre_engine_staffing.get("hoh", {}).get("cut_priority", [])]
             role_norm = normalize_role(shift.get("role"))
@@ -3986,9 +4255,9 @@ class ScheduleGenerator:
     ) -> Dict[Tuple[int, str], List[int]]:
         coverage: Dict[Tuple[int, str], List[int]] = {}
         for key, payload in matrix.items():
-            coverage[key] = [0 for _ in payload.get("slots", [])]
+            coverage[key] = [0] * len(payload.get("slots", ()))
         for shift in assignments:
-            shift_group = shift.get("_role_group") or self._canonical_group(role_group(shift.get("role")))
+            shift_group = self._shift_group(shift)
             for (day_index, group_name), payload in matrix.items():
                 if group_name != shift_group:
                     continue
@@ -4024,7 +4293,9 @@ class ScheduleGenerator:
                 slots = payload.get("slots", [])
                 if not slots:
                     continue
-                cov_row = coverage.get((idx, group_name), [0 for _ in slots])
+                cov_row = coverage.get((idx, group_name))
+                if cov_row is None:
+                    cov_row = [0] * len(slots)
                 hourly: List[str] = []
                 current_hour = None
                 bucket: List[int] = []
@@ -4070,7 +4341,7 @@ class ScheduleGenerator:
         self.unfilled_slots = []
 
     def _find_emergency_candidate(self, demand: BlockDemand) -> Optional[Dict[str, Any]]:
-        ordered = sorted(self.employees, key=lambda record: record.get("total_hours", 0.0))
+        ordered = sorted(self.employees, key=itemgetter("total_hours"))
         for employee in ordered:
             if not self._employee_can_cover_role(employee, demand.role):
                 continue
@@ -4088,7 +4359,7 @@ class ScheduleGenerator:
         """Reserve manager fallback for last-resort coverage with strict limits."""
         if not self.manager_fallback_allowed:
             return False
-        role_norm = normalize_role(demand.role)
+        role_norm = self._role_metadata(demand.role)["normalized"]
         if role_group(demand.role) == "Cashier":
             return False
         if any(token in role_norm for token in self.manager_fallback_disallow):
@@ -4124,7 +4395,7 @@ class ScheduleGenerator:
         start_dt = payload.get("start", demand.start)
         end_dt = payload.get("end", demand.end)
         day_start = datetime.datetime.combine(demand.date, datetime.time.min, tzinfo=UTC)
-        close_dt = day_start + datetime.timedelta(minutes=close_minutes(self.policy, demand.date))
+        close_dt = day_start + datetime.timedelta(minutes=self._open_close_minutes(demand.date)[1])
         if close_dt <= start_dt:
             close_dt = close_dt + datetime.timedelta(days=1)
         buffer_cap = max(30, self.close_buffer_minutes or 30)
@@ -4152,6 +4423,7 @@ class ScheduleGenerator:
             always_on=demand.always_on,
             role_group=demand.role_group,
             hourly_rate=demand.hourly_rate,
+            cut_rank=demand.cut_rank,
         )
         adjusted.recommended_cut = filler_end
         adjusted.max_capacity = 1
@@ -4219,9 +4491,7 @@ class ScheduleGenerator:
 
         start_minutes, _ = self._demand_window_minutes(demand)
         pressure = self.group_pressure.get(demand.day_index, {}).get(demand.role_group, 1.0)
-        demand_index = 1.0
-        if 0 <= demand.day_index < len(self.day_contexts):
-            demand_index = self.day_contexts[demand.day_index].get("indices", {}).get("demand_index", 1.0)
+        demand_index = self._day_demand_index(demand.day_index)
 
         stagger_step = 12
         if pressure >= 1.15:
@@ -4253,7 +4523,7 @@ class ScheduleGenerator:
             else:
                 score = base_score
             scored.append((score, idx))
-        scored.sort(key=lambda item: item[0], reverse=True)
+        scored.sort(key=itemgetter(0), reverse=True)
 
         early_indices = [idx for _score, idx in scored[:cuttable_slots]]
         planned_end_times: List[datetime.datetime] = [latest_cut for _ in entries]
@@ -4264,9 +4534,13 @@ class ScheduleGenerator:
         linear_step = span_minutes / max(1, len(early_indices) - 1) if len(early_indices) > 1 else span_minutes
         linear_step = max(4, min(stagger_step, int(linear_step))) if linear_step > 0 else stagger_step
 
+        if jitter_range:
+            jitters = [self.random.randint(-jitter_range, jitter_range) for _ in early_indices]
+        else:
+            jitters = [0] * len(early_indices)
         for order, idx in enumerate(early_indices):
             payload, employee = entries[idx]
-            jitter = self.random.randint(-jitter_range, jitter_range) if jitter_range else 0
+            jitter = jitters[order]
             cut_time = latest_cut - datetime.timedelta(minutes=(linear_step * order) + jitter)
             floor_time = demand.start + min_duration
             if cut_time < floor_time:
@@ -4278,18 +4552,25 @@ class ScheduleGenerator:
 
         remaining_indices = [idx for _score, idx in scored if idx not in early_indices]
         trailing_step = max(3, min(10, (stagger_step // 2) + 2))
+        remaining_count = len(remaining_indices)
+        if jitter_range and remaining_count > 1:
+            trailing_jitters = [self.random.randint(0, jitter_range) for _ in range(remaining_count)]
+        else:
+            trailing_jitters = [0] * remaining_count
+        # Work in minutes past the block start and only build datetimes for the final cut.
+        one_minute = datetime.timedelta(minutes=1)
+        floor_time = demand.start + min_duration
+        floor_minutes = min_duration / one_minute
+        latest_minutes = (latest_cut - demand.start) / one_minute
         for order, idx in enumerate(remaining_indices):
-            payload, employee = entries[idx]
-            back_offset = max(len(remaining_indices) - order - 1, 0)
-            cut_time = latest_cut - datetime.timedelta(minutes=trailing_step * back_offset)
-            if jitter_range and len(remaining_indices) > 1:
-                jitter = self.random.randint(0, jitter_range)
-                cut_time = cut_time - datetime.timedelta(minutes=jitter)
-            if cut_time < demand.start + min_duration:
-                cut_time = demand.start + min_duration
-            if cut_time > latest_cut:
-                cut_time = latest_cut
-            planned_end_times[idx] = cut_time
+            back_offset = remaining_count - order - 1
+            cut_minutes = latest_minutes - trailing_step * back_offset - trailing_jitters[order]
+            if cut_minutes < floor_minutes:
+                planned_end_times[idx] = floor_time
+            elif cut_minutes >= latest_minutes:
+                planned_end_times[idx] = latest_cut
+            else:
+                planned_end_times[idx] = demand.start + datetime.timedelta(minutes=cut_minutes)
 
         if self.open_close_order_mode != "off" and len(entries) > 1:
             violations, locked_only = self._fifo_violation_state(entries, planned_end_times, demand, start_minutes)
@@ -4321,10 +4602,10 @@ class ScheduleGenerator:
         payload["end"] = end_time
         rate = self._employee_role_wage(employee, demand.role)
         payload["labor_rate"] = rate
-        payload["labor_cost"] = self._compute_cost(payload["start"], end_time, rate)
+        payload["labor_cost"] = self._minutes_cost((end_time - payload["start"]) / ONE_MINUTE, rate)
         payload["notes"] = ", ".join(labels)
         if employee and end_time < demand.end:
-            delta_hours = max(0.0, (demand.end - end_time).total_seconds() / 3600)
+            delta_hours = (demand.end - end_time) / ONE_MINUTE / 60
             employee["total_hours"] = max(0.0, employee.get("total_hours", 0.0) - delta_hours)
 
     def _cut_priority_score(
@@ -4337,10 +4618,10 @@ class ScheduleGenerator:
         """Higher scores mean the employee should be released earlier."""
         if not employee:
             return float("-inf")
-        day_assignments = employee["assignments"].get(demand.day_index, [])
-        day_minutes = sum(end - start for start, end in day_assignments)
-        day_hours = day_minutes / 60.0
-        earliest_start = min((start for start, _ in day_assignments), default=start_minutes)
+        day_hours = employee["day_minutes"][demand.day_index] / 60.0
+        earliest_start = employee["day_earliest_start"][demand.day_index]
+        if earliest_start is None:
+            earliest_start = start_minutes
         started_early = earliest_start < start_minutes
         long_day_bonus = 1.5 if day_hours >= 7 else (0.75 if day_hours >= 5 else 0.0)
         weekly_hours = employee.get("total_hours", 0.0)
@@ -4351,43 +4632,56 @@ class ScheduleGenerator:
         """Higher weight means this person should leave earlier based on earliest start (FIFO)."""
         if not employee:
             return 0.0
-        day_assignments = employee["assignments"].get(demand.day_index, [])
-        if not day_assignments:
+        earliest_start = employee["day_earliest_start"][demand.day_index]
+        if earliest_start is None:
             return 0.0
-        earliest_start = min(start for start, _ in day_assignments)
         age_minutes = max(0, start_minutes - earliest_start)
         # 30 minute chunks, capped to avoid overpowering budget logic.
         return min(6.0, age_minutes / 30.0)
 
     @staticmethod
     def _ordinal_label(value: int) -> str:
-        if 10 <= value % 100 <= 20:
-            suffix = "th"
-        else:
-            suffix = {1: "st", 2: "nd", 3: "rd"}.get(value % 10, "th")
-        return f"{value}{suffix}"
+        return f"{value}{_ORDINAL_SUFFIX[value % 100]}"
 
     def _select_employee(self, demand: BlockDemand) -> Optional[Dict[str, Any]]:
+        role_cfg = role_definition(self.policy, demand.role)
+        block_hours = demand.duration_hours
+        weekly_limit = self.max_hours_per_week + 1e-6
+        score_terms = self._demand_score_terms(demand, role_cfg)
+        is_closer = score_terms[3]
         candidate_sets: List[List[Dict[str, Any]]] = []
         pending_openers = self._pending_opener_candidates(demand)
         if pending_openers:
-            candidate_sets.append(pending_openers)
-        candidate_sets.append(self.employees)
+            candidate_sets.append(self._role_eligible(pending_openers, demand.role))
+        if self.employees:
+            candidate_sets.append(self._role_pool(demand.role))
+
+        # Narrow each pool once; both overflow passes walk the same candidate lists. The weekly-hours
+        # and consecutive-day checks do not depend on the overflow pass, so they mask the pool up
+        # front instead of being repeated per pass.
+        candidate_lists: List[List[Dict[str, Any]]] = [
+            [
+                employee
+                for employee in pool
+                if employee["total_hours"] + block_hours <= weekly_limit
+                and not self._would_violate_consecutive(employee, demand.day_index)
+            ]
+            for pool in candidate_sets
+        ]
 
+        # Bound once: the scoring loop below runs for every surviving candidate on every demand.
+        employee_available = self._employee_available
+        score_candidate = self._score_candidate
         for allow_overflow in (False, True):
-            for pool in candidate_sets:
-                if not pool:
-                    continue
-                exact_pool = [candidate for candidate in pool if demand.role in candidate.get("roles", set())]
-                candidates = exact_pool if exact_pool else pool
+            for candidates in candidate_lists:
                 best_candidate = None
                 best_score = float("-inf")
                 for employee in candidates:
-                    if not self._employee_can_cover_role(employee, demand.role):
-                        continue
-                    if not self._employee_available(employee, demand, allow_desired_overflow=allow_overflow):
+                    if not employee_available(
+                        employee, demand, allow_desired_overflow=allow_overflow, is_closer=is_closer
+                    ):
                         continue
-                    score = self._score_candidate(employee, demand, allow_overflow=allow_overflow)
+                    score = score_candidate(employee, demand, allow_overflow=allow_overflow, score_terms=score_terms)
                     if score > best_score:
                         best_score = score
                         best_candidate = employee
@@ -4395,37 +4689,56 @@ class ScheduleGenerator:
                     return best_candidate
         return None
 
+    def _role_eligible(self, pool: List[Dict[str, Any]], role_name: str) -> List[Dict[str, Any]]:
+        """Prefer exact role holders in ``pool``, keeping only employees able to cover ``role_name``."""
+        exact_pool = [candidate for candidate in pool if role_name in candidate.get("roles", set())]
+        return [
+            employee
+            for employee in (exact_pool if exact_pool else pool)
+            if self._employee_can_cover_role(employee, role_name)
+        ]
+
+    def _role_pool(self, role_name: str) -> List[Dict[str, Any]]:
+        """Role-eligible roster for ``role_name``, built once per attempt.
+
+        Role coverage is fixed for an attempt, so every demand for the role reuses the same base pool
+        and only the volatile hours/day checks are applied per demand.
+        """
+        pool = self._role_pools.get(role_name)
+        if pool is None:
+            pool = self._role_pools[role_name] = self._role_eligible(self.employees, role_name)
+        return pool
+
     def _pending_opener_candidates(self, demand: BlockDemand) -> List[Dict[str, Any]]:
         start_minutes, _ = self._demand_window_minutes(demand)
-        tolerance = max(5, self.round_to_minutes)
-        normalized_role = normalize_role(demand.role)
+        tolerance = self._tolerance_5
+        normalized_role = self._role_metadata(demand.role)["normalized"]
         matches: Dict[int, Tuple[int, Dict[str, Any]]] = {}
-        for employee in self.employees:
+        for employee, link in self._opener_index.get(demand.day_index, []):
+            if employee["id"] in matches:
+                # Only the employee's first matching link counts, mirroring queue order.
+                continue
+            if link.get("fulfilled"):
+                continue
             queue = employee.get("pending_open_links", {}).get(demand.day_index, [])
-            if not queue:
+            if not any(pending is link for pending in queue):
                 continue
-            for link in queue:
-                if link.get("fulfilled"):
-                    continue
-                target_start = link.get("target_start")
-                deadline = link.get("deadline", target_start)
-                if target_start is None:
-                    continue
-                if start_minutes < target_start - tolerance or start_minutes > deadline + tolerance:
+            target_start = link.get("target_start")
+            deadline = link.get("deadline", target_start)
+            if target_start is None:
+                continue
+            if start_minutes < target_start - tolerance or start_minutes > deadline + tolerance:
+                continue
+            covers = link.get("covers") or set()
+            role_group = link.get("role_group")
+            if normalized_role not in covers and demand.role_group != role_group:
+                # Allow HOH - All Roles to satisfy any kitchen opener/cover need.
+                if not (
+                    role_group == "Kitchen"
+                    and any(normalize_role(role) == _HOH_ALL_ROLES for role in employee.get("roles", []))
+                ):
                     continue
-                covers = link.get("covers") or set()
-                role_group = link.get("role_group")
-                if normalized_role not in covers and demand.role_group != role_group:
-                    # Allow HOH - All Roles to satisfy any kitchen opener/cover need.
-                    if not (
-                        role_group == "Kitchen"
-                        and any(normalize_role(role) == normalize_role("HOH - All Roles") for role in employee.get("roles", []))
-                    ):
-                        continue
-                existing = matches.get(employee["id"])
-                if existing is None or target_start < existing[0]:
-                    matches[employee["id"]] = (target_start, employee)
-                break
+            matches[employee["id"]] = (target_start, employee)
         ordered = sorted(matches.values(), key=lambda entry: (entry[0], entry[1]["id"]))
         return [entry[1] for entry in ordered]
 
@@ -4435,17 +4748,27 @@ class ScheduleGenerator:
         best_score = float("inf")
         for employee in self.employees:
             roles = employee.get("roles", set())
-            if not any(role_group(r) == "Kitchen" or normalize_role(r) == normalize_role("HOH - All Roles") for r in roles):
+            if not any(role_group(r) == "Kitchen" or normalize_role(r) == _HOH_ALL_ROLES for r in roles):
                 continue
             if not self._employee_available(employee, demand, allow_desired_overflow=True):
                 continue
-            load = len(employee["assignments"].get(demand.day_index, []))
+            load = len(employee["assignments"][demand.day_index])
             if load < best_score:
                 best_score = load
                 best = employee
         return best
 
     def _employee_can_cover_role(self, employee: Dict[str, Any], role_name: str) -> bool:
+        role_cover = employee.get("role_cover")
+        if role_cover is None:
+            return self._resolve_role_cover(employee, role_name)
+        covered = role_cover.get(role_name)
+        if covered is None:
+            # Roles outside the policy table resolve on first use and stay on the record.
+            covered = role_cover[role_name] = self._resolve_role_cover(employee, role_name)
+        return covered
+
+    def _resolve_role_cover(self, employee: Dict[str, Any], role_name: str) -> bool:
         if not role_name:
             return False
         candidate_roles = employee.get("roles") or set()
@@ -4463,7 +4786,7 @@ class ScheduleGenerator:
                 # Allow explicit all-roles cashier or any cashier-group role/covers.
                 if candidate_group == "Management":
                     continue
-                if normalize_role(candidate) == normalize_role("Cashier - All Roles"):
+                if normalize_role(candidate) == _CASHIER_ALL_ROLES:
                     return True
                 if candidate_group == "Cashier":
                     return True
@@ -4478,7 +4801,7 @@ class ScheduleGenerator:
                     if not role_matches(candidate, role_name):
                         continue
                 # HOH - All Roles can satisfy any kitchen role (including opener).
-                if normalize_role(candidate) == normalize_role("HOH - All Roles"):
+                if normalize_role(candidate) == _HOH_ALL_ROLES:
                     return True
             if target_group in {"Servers", "Bartenders"} and candidate_group == "Kitchen":
                 if not role_matches(candidate, role_name):
@@ -4515,23 +4838,37 @@ class ScheduleGenerator:
         *,
         allow_desired_overflow: bool = False,
         ignore_split: bool = False,
+        is_closer: Optional[bool] = None,
     ) -> bool:
-        assignments = employee["assignments"][demand.day_index]
+        day_index = demand.day_index
+        assignments = employee["assignments"][day_index]
         demand_start_minutes, demand_end_minutes = self._demand_window_minutes(demand)
-        for start_minute, end_minute in assignments:
-            if demand_start_minutes < end_minute and demand_end_minutes > start_minute:
-                return False
+        # Starts are kept sorted, so only entries starting before the demand ends can overlap;
+        # the parallel running max of their ends answers the overlap test with one indexed read.
+        overlap_count = bisect_left(employee["day_starts"][day_index], demand_end_minutes)
+        if overlap_count and employee["day_end_max"][day_index][overlap_count - 1] > demand_start_minutes:
+            return False
         if not self.allow_split_shifts and assignments and not ignore_split:
             return False
-        for offset, seg_start, seg_end in self._demand_day_segments(demand):
-            day_idx = (demand.day_index + offset) % 7
-            for window_start, window_end in employee["unavailability"].get(day_idx, []):
-                if seg_start < window_end and seg_end > window_start:
+        unavailability_masks = employee.get("unavailability_masks")
+        for offset, seg_start, seg_end, seg_mask in self._demand_day_segments(demand):
+            day_idx = (day_index + offset) % 7
+            if unavailability_masks is not None:
+                if unavailability_masks[day_idx] & seg_mask:
+                    return False
+                residual_starts = employee["unavailability_residual_starts"].get(day_idx)
+                if residual_starts:
+                    residual_count = bisect_left(residual_starts, seg_end)
+                    if (
+                        residual_count
+                        and employee["unavailability_residual_end_max"][day_idx][residual_count - 1] > seg_start
+                    ):
+                        return False
+                continue
+            windows = employee["unavailability"].get(day_idx, [])
+            for idx in range(bisect_left(windows, (seg_end,))):
+                if windows[idx][1] > seg_start:
                     return False
-        same_day_assignment = demand.day_index in employee["days_with_assignments"]
-        last_end = employee["last_assignment_end"]
-        if last_end and not same_day_assignment:
-            pass
         block_hours = demand.duration_hours
         projected_hours = employee["total_hours"] + block_hours
         if projected_hours > self.max_hours_per_week + 1e-6:
@@ -4542,11 +4879,11 @@ class ScheduleGenerator:
                 return False
         except (TypeError, ValueError):
             pass
-        day_minutes = sum(end - start for start, end in employee["assignments"][demand.day_index])
-        day_hours = day_minutes / 60.0
-        day_meta = (employee.get("day_meta") or {}).get(demand.day_index, [])
+        day_hours = employee["day_minutes"][day_index] / 60.0
+        meta_by_day = employee.get("day_meta")
+        day_meta = meta_by_day[day_index] if meta_by_day else ()
         has_non_close = any((entry.get("location") or "").strip().lower() not in {"close"} for entry in day_meta)
-        is_closer_block = self._is_closer_block(demand.role, demand.block_name) or demand.block_name.strip().lower() == "close"
+        is_closer_block = self._demand_is_closer(demand) if is_closer is None else is_closer
         if self.max_hours_per_day > 0:
             proposed_day_hours = day_hours + block_hours
             if is_closer_block:
@@ -4564,7 +4901,7 @@ class ScheduleGenerator:
             and projected_hours > desired_ceiling + 1e-6
         ):
             return False
-        if self._would_violate_consecutive(employee, demand.day_index):
+        if self._would_violate_consecutive(employee, day_index):
             return False
         return True
 
@@ -4591,20 +4928,14 @@ class ScheduleGenerator:
         demand: BlockDemand,
         *,
         allow_overflow: bool = False,
+        score_terms: Optional[Tuple[float, float, bool, bool]] = None,
     ) -> float:
-        role_cfg = role_definition(self.policy, demand.role)
-        priority = 0.5
-        try:
-            priority = float(role_cfg.get("priority", 0.5))
-        except (TypeError, ValueError):
-            priority = 0.5
+        if score_terms is None:
+            score_terms = self._demand_score_terms(demand, role_definition(self.policy, demand.role))
+        priority, wage_penalty, is_servers, is_closer = score_terms
+        desired, floor, ceiling, window_span = employee.get("score_profile") or self._employee_score_profile(employee)
         block_hours = demand.duration_hours
         projected_hours = employee["total_hours"] + block_hours
-        desired = employee["desired_hours"] or employee.get("desired_ceiling") or self.max_hours_per_week
-        desired = desired or self.max_hours_per_week
-        floor = max(0.0, employee.get("desired_floor", 0.0))
-        ceiling = max(floor, employee.get("desired_ceiling", self.max_hours_per_week) or self.max_hours_per_week)
-        window_span = max(1.0, ceiling - floor)
         if projected_hours < floor:
             coverage_focus = 1.0 + (floor - projected_hours) / max(1.0, desired)
         elif projected_hours <= ceiling:
@@ -4614,23 +4945,20 @@ class ScheduleGenerator:
             coverage_focus = -overflow / max(1.0, desired)
             if not allow_overflow:
                 coverage_focus -= 0.5
-        day_minutes = sum(end - start for start, end in employee["assignments"][demand.day_index])
-        day_hours = day_minutes / 60.0
+        day_hours = employee["day_minutes"][demand.day_index] / 60.0
+        day_load = len(employee["assignments"][demand.day_index])
         continuity = 0.2 if self._continues_assignment(employee, demand) else 0.0
-        if role_group(demand.role) == "Servers":
+        if is_servers:
             continuity *= 0.5
-        is_closer = self._is_closer_block(demand.role, demand.block_name) or demand.block_name.strip().lower() == "close"
         if is_closer:
-            if employee["assignments"][demand.day_index]:
+            if day_load:
                 continuity += 0.4
             else:
                 continuity -= 0.3
-        day_load = len(employee["assignments"][demand.day_index])
         availability_bonus = max(-0.15, 0.3 - 0.1 * day_load)
         day_fairness = max(-0.4, 0.15 * (1 - (day_hours / 6.0)))  # prefer those working less today
         if day_hours >= 7.0:
             day_fairness -= 0.25
-        wage_penalty = self._role_wage(demand.role) * 0.02
         overtime_penalty = self.overtime_penalty if projected_hours > self.max_hours_per_week else 0.0
         consecutive_penalty = 0.05 * max(0, employee.get("consecutive_days", 0) - 3)
         distribution_bonus = max(-0.2, 0.2 * (1 - (employee["total_hours"] / max(1.0, ceiling))))
@@ -4647,44 +4975,86 @@ class ScheduleGenerator:
             + self.random.uniform(-0.05, 0.05)
         )
 
+    def _employee_score_profile(self, employee: Dict[str, Any]) -> Tuple[float, float, float, float]:
+        """Assignment-independent (desired, floor, ceiling, window_span) terms of _score_candidate."""
+        desired = employee["desired_hours"] or employee.get("desired_ceiling") or self.max_hours_per_week
+        desired = desired or self.max_hours_per_week
+        floor = max(0.0, employee.get("desired_floor", 0.0))
+        ceiling = max(floor, employee.get("desired_ceiling", self.max_hours_per_week) or self.max_hours_per_week)
+        return desired, floor, ceiling, max(1.0, ceiling - floor)
+
+    def _demand_score_terms(
+        self, demand: BlockDemand, role_cfg: Dict[str, Any]
+    ) -> Tuple[float, float, bool, bool]:
+        """Employee-independent (priority, wage_penalty, is_servers, is_closer) terms of _score_candidate."""
+        try:
+            priority = float(role_cfg.get("priority", 0.5))
+        except (TypeError, ValueError):
+            priority = 0.5
+        return (
+            priority,
+            self._role_wage(demand.role) * 0.02,
+            role_group(demand.role) == "Servers",
+            self._demand_is_closer(demand),
+        )
+
+    def _demand_is_closer(self, demand: BlockDemand) -> bool:
+        return self._is_closer_block(demand.role, demand.block_name) or demand.block_name.strip().lower() == "close"
+
     def _continues_assignment(self, employee: Dict[str, Any], demand: BlockDemand) -> bool:
         last_end = employee["day_last_block_end"][demand.day_index]
         start_minutes, _ = self._demand_window_minutes(demand)
         if last_end is None:
             return False
-        tolerance = max(1, self.round_to_minutes)
+        tolerance = self._tolerance_1
         return abs(start_minutes - last_end) <= tolerance
 
     def _closer_has_continuity(self, assignments: List[Tuple[int, int]], demand_start_minutes: int) -> bool:
         if not assignments:
             return False
-        tolerance = max(5, self.round_to_minutes)
+        tolerance = self._tolerance_5
         latest_end = max(end for _start, end in assignments)
         earliest_start = min(start for start, _end in assignments)
         return latest_end >= demand_start_minutes - tolerance and earliest_start < demand_start_minutes
 
     def _register_assignment(self, employee: Dict[str, Any], demand: BlockDemand) -> None:
+        day_index = demand.day_index
         start_minutes, end_minutes = self._demand_window_minutes(demand)
-        employee["assignments"][demand.day_index].append((start_minutes, end_minutes))
-        employee["day_last_block_end"][demand.day_index] = end_minutes
+        insort(employee["assignments"][day_index], (start_minutes, end_minutes))
+        day_starts = employee["day_starts"][day_index]
+        position = bisect_right(day_starts, start_minutes)
+        day_starts.insert(position, start_minutes)
+        end_max = employee["day_end_max"][day_index]
+        end_max.insert(position, max(end_max[position - 1], end_minutes) if position else end_minutes)
+        # Entries after the insert only need raising until the running max already covers this end.
+        for idx in range(position + 1, len(end_max)):
+            if end_max[idx] >= end_minutes:
+                break
+            end_max[idx] = end_minutes
+        employee["day_minutes"][day_index] += end_minutes - start_minutes
+        earliest_by_day = employee["day_earliest_start"]
+        earliest_start = earliest_by_day[day_index]
+        if earliest_start is None or start_minutes < earliest_start:
+            earliest_by_day[day_index] = start_minutes
+        employee["day_last_block_end"][day_index] = end_minutes
         employee["total_hours"] += demand.duration_hours
-        employee["last_assignment_end"] = demand.end
         if "day_meta" in employee:
-            employee["day_meta"][demand.day_index].append(
+            employee["day_meta"][day_index].append(
                 {
                     "location": (demand.block_name or "").strip(),
                     "role": demand.role,
                     "group": demand.role_group,
                 }
             )
-        if demand.day_index not in employee["days_with_assignments"]:
+        days_with_assignments = employee["days_with_assignments"]
+        if day_index not in days_with_assignments:
             last_day = employee.get("last_day_index")
-            if last_day is not None and demand.day_index == last_day + 1:
+            if last_day is not None and day_index == last_day + 1:
                 employee["consecutive_days"] = employee.get("consecutive_days", 0) + 1
             else:
                 employee["consecutive_days"] = 1
-            employee["last_day_index"] = demand.day_index
-            employee["days_with_assignments"].add(demand.day_index)
+            employee["last_day_index"] = day_index
+            days_with_assignments.add(day_index)
         self._track_opener_continuity(employee, demand, start_minutes, end_minutes)
 
     def _track_opener_continuity(
@@ -4704,30 +5074,31 @@ class ScheduleGenerator:
     def _create_open_link_requirement(self, employee: Dict[str, Any], demand: BlockDemand, end_minutes: int) -> None:
         queue = employee["pending_open_links"].setdefault(demand.day_index, [])
         role_cfg = role_definition(self.policy, demand.role)
-        covers = {normalize_role(demand.role)}
+        covers = {self._role_metadata(demand.role)["normalized"]}
         for cover in role_cfg.get("covers", []) or []:
             normalized = normalize_role(cover)
             if normalized:
                 covers.add(normalized)
-        tolerance = max(5, self.round_to_minutes)
-        queue.append(
-            {
-                "target_start": end_minutes,
-                "deadline": end_minutes + tolerance,
-                "covers": covers,
-                "role_group": demand.role_group,
-                "role": demand.role,
-                "fulfilled": False,
-            }
-        )
+        tolerance = self._tolerance_5
+        link = {
+            "target_start": end_minutes,
+            "deadline": end_minutes + tolerance,
+            "covers": frozenset(covers),
+            "role_group": demand.role_group,
+            "role": demand.role,
+            "fulfilled": False,
+        }
+        queue.append(link)
+        self._opener_index.setdefault(demand.day_index, []).append((employee, link))
 
     def _fulfill_open_link_requirement(self, employee: Dict[str, Any], demand: BlockDemand, start_minutes: int) -> None:
         queue = employee["pending_open_links"].get(demand.day_index)
         if not queue:
             return
-        normalized_role = normalize_role(demand.role)
-        tolerance = max(5, self.round_to_minutes)
-        for idx, link in enumerate(list(queue)):
+        normalized_role = self._role_metadata(demand.role)["normalized"]
+        tolerance = self._tolerance_5
+        # Safe to walk the live queue: we stop right after the single pop.
+        for idx, link in enumerate(queue):
             if link.get("fulfilled"):
                 continue
             target_start = link.get("target_start")
@@ -4736,11 +5107,14 @@ class ScheduleGenerator:
             deadline = link.get("deadline", target_start)
             if start_minutes < target_start - tolerance or start_minutes > deadline + tolerance:
                 continue
-            covers = link.get("covers") or set()
-            role_group = link.get("role_group")
-            if normalized_role not in covers and demand.role_group != role_group:
+            if demand.role_group != link.get("role_group") and normalized_role not in (link.get("covers") or ()):
                 continue
             queue.pop(idx)
+            day_index_links = self._opener_index.get(demand.day_index, [])
+            for pos, (_employee, indexed) in enumerate(day_index_links):
+                if indexed is link:
+                    day_index_links.pop(pos)
+                    break
             break
 
     def _enforce_shift_continuity(self, assignments: List[Dict[str, Any]], week_start: datetime.date) -> None:
@@ -4750,39 +5124,37 @@ class ScheduleGenerator:
         """
         if not assignments:
             return
-        # Drop exact duplicates (same employee, role, start/end, location).
-        unique: List[Dict[str, Any]] = []
+        tolerance = self._tolerance_5_td
+        # One pass drops exact duplicates (same employee, role, start/end, location) and buckets the rest by
+        # employee/role/day in order of first appearance; each bucket is then sorted by start and swept once.
         seen_keys: Set[Tuple[Any, str, datetime.datetime, datetime.datetime, str]] = set()
+        buckets: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
         for payload in assignments:
             start_dt = payload.get("start")
             end_dt = payload.get("end")
             if not isinstance(start_dt, datetime.datetime) or not isinstance(end_dt, datetime.datetime):
-                unique.append(payload)
+                buckets[(id(payload),)] = [payload]
                 continue
-            key = (
-                payload.get("employee_id"),
-                payload.get("role"),
-                start_dt,
-                end_dt,
-                (payload.get("location") or "").lower(),
-            )
+            emp_id = payload.get("employee_id")
+            role_name = payload.get("role")
+            key = (emp_id, role_name, start_dt, end_dt, (payload.get("location") or "").lower())
             if key in seen_keys:
                 continue
             seen_keys.add(key)
-            unique.append(payload)
-        assignments[:] = unique
-        tolerance = datetime.timedelta(minutes=max(5, self.round_to_minutes))
-        grouped: Dict[Tuple[Any, str, datetime.date], List[Dict[str, Any]]] = defaultdict(list)
-        for payload in assignments:
-            emp_id = payload.get("employee_id")
-            role_name = payload.get("role")
-            key = (emp_id, role_name, payload["start"].date())
-            grouped[key].append(payload)
+            group_key = (emp_id, role_name, start_dt.date())
+            bucket = buckets.get(group_key)
+            if bucket is None:
+                buckets[group_key] = [payload]
+            else:
+                bucket.append(payload)
         merged: List[Dict[str, Any]] = []
-        for key, shifts in grouped.items():
-            shifts.sort(key=lambda s: s["start"])
-            current = shifts[0]
-            for nxt in shifts[1:]:
+        for bucket in buckets.values():
+            if len(bucket) == 1:
+                merged.append(bucket[0])
+                continue
+            bucket.sort(key=itemgetter("start"))
+            current = bucket[0]
+            for nxt in bucket[1:]:
                 if nxt["start"] <= current["end"] + tolerance and (current.get("location") == nxt.get("location")):
                     current["end"] = max(current["end"], nxt["end"])
                     current["labor_cost"] = self._compute_cost(
@@ -4798,8 +5170,7 @@ class ScheduleGenerator:
                 merged.append(current)
                 current = nxt
             merged.append(current)
-        assignments.clear()
-        assignments.extend(merged)
+        assignments[:] = merged
 
     def _normalize_bartender_openers(self, assignments: List[Dict[str, Any]]) -> None:
         """Force bartender opener to 10:30-11:00 window to avoid template drift."""
@@ -4812,7 +5183,7 @@ class ScheduleGenerator:
         garbage: List[Dict[str, Any]] = []
         for shift in assignments:
             role_norm = normalize_role(shift.get("role", ""))
-            if role_norm != normalize_role("Bartender - Opener"):
+            if role_norm != _BARTENDER_OPENER:
                 continue
             start = shift.get("start")
             if not isinstance(start, datetime.datetime):
@@ -4827,6 +5198,7 @@ class ScheduleGenerator:
             seen.add(key)
             forced_start, forced_end = forced
             shift["start"] = self._snap_datetime(forced_start)
+            shift["_start_date"] = shift["start"].date()
             shift["end"] = self._snap_datetime(forced_end)
             shift["labor_cost"] = self._compute_cost(shift["start"], shift["end"], shift.get("labor_rate", 0.0))
             shift["notes"] = self._append_note(shift.get("notes"), "Opener fixed 10:30-11:00")
@@ -4843,7 +5215,7 @@ class ScheduleGenerator:
         assignments: List[Dict[str, Any]],
         week_start: datetime.date,
     ) -> None:
-        tolerance = datetime.timedelta(minutes=max(5, self.round_to_minutes))
+        tolerance = self._tolerance_5
         for employee in self.employees:
             links_by_day = employee.get("pending_open_links") or {}
             for day_index, links in list(links_by_day.items()):
@@ -4852,7 +5224,7 @@ class ScheduleGenerator:
                 active_shifts = [
                     shift
                     for shift in day_map.get(day_index, [])
-                    if (shift.get("location") or "").strip().lower() not in {"open", "close"}
+                    if shift["_loc_norm"] not in {"open", "close"}
                 ]
                 if not active_shifts:
                     links_by_day[day_index] = []
@@ -4860,8 +5232,9 @@ class ScheduleGenerator:
                 for link in list(links):
                     if link.get("fulfilled"):
                         continue
+                    target_minutes = day_index * 24 * 60 + link.get("target_start", 0)
                     target_dt = self._day_datetime(week_start, day_index, link.get("target_start", 0))
-                    if self._assign_existing_followup(active_shifts, employee, target_dt, link, tolerance):
+                    if self._assign_existing_followup(active_shifts, employee, target_minutes, link, tolerance):
                         links.remove(link)
                         continue
                     if self._create_open_followup_shift(
@@ -4875,9 +5248,9 @@ class ScheduleGenerator:
         self,
         day_shifts: List[Dict[str, Any]],
         employee: Dict[str, Any],
-        target_dt: datetime.datetime,
+        target_minutes: int,
         link: Dict[str, Any],
-        tolerance: datetime.timedelta,
+        tolerance: int,
     ) -> bool:
         if not day_shifts:
             return False
@@ -4887,16 +5260,16 @@ class ScheduleGenerator:
         normalized_role = normalize_role(link.get("role") or "")
         candidates: List[Dict[str, Any]] = []
         for shift in day_shifts:
-            loc = (shift.get("location") or "").strip().lower()
+            loc = shift["_loc_norm"]
             if loc in {"open", "close"}:
                 continue
             if shift.get("employee_id") == emp_id:
-                if shift["start"] >= target_dt - tolerance:
+                if shift["_start_min"] >= target_minutes - tolerance:
                     return True
                 continue
             if shift.get("_followup_locked"):
                 continue
-            if shift["start"] < target_dt - tolerance:
+            if shift["_start_min"] < target_minutes - tolerance:
                 continue
             if normalized_role and normalize_role(shift["role"]) != normalized_role:
                 covers = link.get("covers") or set()
@@ -4906,7 +5279,7 @@ class ScheduleGenerator:
             candidates.append(shift)
         if not candidates:
             return False
-        chosen = sorted(candidates, key=lambda payload: (payload["start"], payload["end"]))[0]
+        chosen = min(candidates, key=itemgetter("_start_min", "_end_min"))
         self._transfer_shift_employee(chosen, emp_id, tag="Opener follow-up")
         chosen["_followup_locked"] = True
         return True
@@ -4949,10 +5322,10 @@ class ScheduleGenerator:
         assignments: List[Dict[str, Any]],
         week_start: datetime.date,
     ) -> None:
-        tolerance = datetime.timedelta(minutes=max(5, self.round_to_minutes))
+        tolerance = self._tolerance_5
         for day_index, shifts in list(day_map.items()):
             for shift in list(shifts):
-                location = (shift.get("location") or "").strip().lower()
+                location = shift["_loc_norm"]
                 if location != "close":
                     continue
                 emp_id = shift.get("employee_id")
@@ -4965,21 +5338,21 @@ class ScheduleGenerator:
                 if any(
                     other is not shift
                     and other.get("employee_id") == emp_id
-                    and (other.get("location") or "").strip().lower() == "close"
+                    and other["_loc_norm"] == "close"
                     and (not closer_group or role_group(other.get("role")) == closer_group)
-                    and isinstance(other.get("end"), datetime.datetime)
-                    and isinstance(shift.get("start"), datetime.datetime)
-                    and abs(other["end"] - shift["start"]) <= tolerance
+                    and other.get("_end_min") is not None
+                    and shift.get("_start_min") is not None
+                    and abs(other["_end_min"] - shift["_start_min"]) <= tolerance
                     for other in day_map.get(op_day, [])
                 ):
                     continue
                 if self._closer_has_prior_assignment(
-                    emp_id, shift["start"], day_map.get(op_day, []), tolerance, closer_group
+                    emp_id, shift["_start_min"], day_map.get(op_day, []), tolerance, closer_group
                 ):
                     continue
                 closer_duration_hours = 0.0
-                if isinstance(shift.get("start"), datetime.datetime) and isinstance(shift.get("end"), datetime.datetime):
-                    closer_duration_hours = max(0.0, (shift["end"] - shift["start"]).total_seconds() / 3600)
+                if shift.get("_start_min") is not None and shift.get("_end_min") is not None:
+                    closer_duration_hours = max(0.0, (shift["_end_min"] - shift["_start_min"]) / 60)
                 if closer_group == "Bartenders" and closer_duration_hours >= 6.0:
                     # Already a substantial PM closer block; skip auto lead-in.
                     continue
@@ -4996,9 +5369,9 @@ class ScheduleGenerator:
     def _closer_has_prior_assignment(
         self,
         employee_id: int,
-        close_start: datetime.datetime,
+        close_start: int,
         day_shifts: List[Dict[str, Any]],
-        tolerance: datetime.timedelta,
+        tolerance: int,
         closer_group: Optional[str],
     ) -> bool:
         if not day_shifts:
@@ -5006,12 +5379,12 @@ class ScheduleGenerator:
         for shift in day_shifts:
             if shift.get("employee_id") != employee_id:
                 continue
-            loc = (shift.get("location") or "").strip().lower()
+            loc = shift["_loc_norm"]
             if loc in {"open", "close"}:
                 continue
             if closer_group and role_group(shift.get("role")) != closer_group:
                 continue
-            if shift["end"] > close_start - tolerance:
+            if shift["_end_min"] > close_start - tolerance:
                 return True
         return False
 
@@ -5020,29 +5393,29 @@ class ScheduleGenerator:
         employee_id: int,
         close_shift: Dict[str, Any],
         day_shifts: List[Dict[str, Any]],
-        tolerance: datetime.timedelta,
+        tolerance: int,
     ) -> bool:
         if not day_shifts:
             return False
         closer_group = role_group(close_shift.get("role"))
         candidates: List[Dict[str, Any]] = []
         for shift in day_shifts:
-            loc = (shift.get("location") or "").strip().lower()
+            loc = shift["_loc_norm"]
             if loc in {"open", "close"}:
                 continue
             if closer_group and role_group(shift.get("role")) != closer_group:
                 continue
             if shift.get("employee_id") == employee_id:
-                if shift["end"] > close_shift["start"] - tolerance:
+                if shift["_end_min"] > close_shift["_start_min"] - tolerance:
                     return True
                 continue
             if shift.get("_followup_locked"):
                 continue
-            if shift["end"] <= close_shift["start"]:
+            if shift["_end_min"] <= close_shift["_start_min"]:
                 candidates.append(shift)
         if not candidates:
             return False
-        chosen = sorted(candidates, key=lambda payload: payload["end"], reverse=True)[0]
+        chosen = max(candidates, key=itemgetter("_end_min"))
         self._transfer_shift_employee(chosen, employee_id, tag="Closer lead-in")
         chosen["_followup_locked"] = True
         return True
@@ -5086,7 +5459,7 @@ class ScheduleGenerator:
 
     def _force_bartender_opener_pair(self, assignments: List[Dict[str, Any]]) -> None:
         """Ensure bartender opener continues into the opener-follow shift (all days)."""
-        tolerance = datetime.timedelta(minutes=max(5, self.round_to_minutes))
+        tolerance = self._tolerance_5_td
         by_date: Dict[datetime.date, List[Dict[str, Any]]] = defaultdict(list)
         for payload in assignments:
             start_dt = payload.get("start")
@@ -5094,7 +5467,7 @@ class ScheduleGenerator:
                 by_date[start_dt.date()].append(payload)
         for shifts in by_date.values():
             for opener in list(shifts):
-                if normalize_role(opener.get("role", "")) != normalize_role("Bartender - Opener"):
+                if normalize_role(opener.get("role", "")) != _BARTENDER_OPENER:
                     continue
                 emp_id = opener.get("employee_id")
                 opener_end = opener.get("end")
@@ -5117,13 +5490,13 @@ class ScheduleGenerator:
                     candidates.append(candidate)
                 if not candidates:
                     continue
-                candidates.sort(
+                follow = min(
+                    candidates,
                     key=lambda payload: (
                         0 if "opener follow" in (payload.get("notes", "").lower()) else 1,
                         payload.get("start"),
-                    )
+                    ),
                 )
-                follow = candidates[0]
                 follow["_followup_locked"] = True
                 if follow.get("employee_id") == emp_id:
                     continue
@@ -5157,32 +5530,62 @@ class ScheduleGenerator:
             "labor_cost": self._compute_cost(start_dt, end_dt, rate),
             "location": location,
             "notes": note,
+            "_start_date": start_dt.date(),
         }
+        if self._week_origin is not None:
+            self._stamp_continuity_fields(payload)
         return payload
 
+    def _stamp_continuity_fields(self, shift: Dict[str, Any]) -> None:
+        """Cache minute offsets and the normalized location read by the continuity passes."""
+        shift["_loc_norm"] = (shift.get("location") or "").strip().lower()
+        start_dt = shift.get("start")
+        end_dt = shift.get("end")
+        if isinstance(start_dt, datetime.datetime) and isinstance(end_dt, datetime.datetime):
+            shift["_start_min"] = (start_dt - self._week_origin) // ONE_MINUTE
+            shift["_end_min"] = (end_dt - self._week_origin) // ONE_MINUTE
+
     def _append_note(self, existing: Optional[str], addition: str) -> str:
         if not existing:
             return addition
-        if addition.lower() in existing.lower():
+        # Repeat tags land at the tail, and exact containment implies the case-insensitive match,
+        # so both cheaper checks run before the lowered copies.
+        if existing.endswith(addition) or addition in existing or addition.lower() in existing.lower():
             return existing
         return f"{existing}, {addition}"
 
+    def _set_week_dates(self, week_start: datetime.date) -> None:
+        """Resolve the week's seven dates and UTC midnights once for day-index lookups."""
+        self._week_dates = tuple(week_start + _TIMEDELTA(days=offset) for offset in range(7))
+        self._week_dates_iso = tuple(day.isoformat() for day in self._week_dates)
+        self._week_start_ordinal = week_start.toordinal()
+        self._week_midnights = tuple(_COMBINE(day, _TIME_MIN, tzinfo=UTC) for day in self._week_dates)
+        self._week_origin = self._week_midnights[0]
+
     def _day_datetime(self, week_start: datetime.date, day_index: int, minutes: int) -> datetime.datetime:
-        day = week_start + datetime.timedelta(days=day_index)
-        return datetime.datetime.combine(day, datetime.time.min, tzinfo=UTC) + datetime.timedelta(minutes=minutes)
+        if self._week_dates and self._week_dates[0] == week_start and 0 <= day_index < 7:
+            return self._week_midnights[day_index] + _TIMEDELTA(minutes=minutes)
+        return _COMBINE(week_start + _TIMEDELTA(days=day_index), _TIME_MIN, tzinfo=UTC) + _TIMEDELTA(minutes=minutes)
+
+    def _minutes_to_dt(self, date_value: datetime.date, minutes: int) -> datetime.datetime:
+        """Materialize minutes past ``date_value``'s UTC midnight; midnights are built once per date."""
+        midnight = self._midnights.get(date_value)
+        if midnight is None:
+            midnight = self._midnights[date_value] = _COMBINE(date_value, _TIME_MIN, tzinfo=UTC)
+        return midnight + _TIMEDELTA(minutes=minutes)
 
     def _day_index_from_datetime(self, week_start: datetime.date, dt: datetime.datetime) -> int:
-        return (dt.date() - week_start).days
+        return dt.toordinal() - week_start.toordinal()
 
     def _warn_unpaired_openers(self) -> None:
         for employee in self.employees:
             for day_index, links in (employee.get("pending_open_links") or {}).items():
                 if not links:
                     continue
-                for _link in links:
-                    self.warnings.append(
-                        f"Opener continuity missing for {employee['name']} on {self._day_label(day_index)}; add a follow-up shift."
-                    )
+                message = (
+                    f"Opener continuity missing for {employee['name']} on {self._day_labels[day_index]}; add a follow-up shift."
+                )
+                self.warnings.extend([message] * len(links))
                 links.clear()
 
     def _check_section_thresholds(self, assignments: List[Dict[str, Any]]) -> None:
@@ -5190,13 +5593,13 @@ class ScheduleGenerator:
         dining_cfg = server_cfg.get("dining", {})
         cocktail_cfg = server_cfg.get("cocktail", {})
         cashier_cfg = self.pre_engine_staffing.get("cashier", {})
-        for day_index in range(7):
+        for day_index, day_shifts in enumerate(self._shifts_by_day):
             ctx = self.day_contexts[day_index] if 0 <= day_index < len(self.day_contexts) else {}
             ctx_date = ctx.get("date")
             adjusted_sales = float(ctx.get("adjusted_sales", 0.0) or 0.0)
             demand_index = ctx.get("indices", {}).get("demand_index", 1.0)
             tier = ctx.get("tier") or self._volume_tier(demand_index, adjusted_sales)
-            day_label = ctx_date or self._day_label(day_index)
+            day_label = ctx_date or self._day_labels[day_index]
 
             dining_am_target, dining_pm_target = self._resolve_server_targets(tier, "dining")
             dining_target = max(dining_am_target, dining_pm_target)
@@ -5207,10 +5610,10 @@ class ScheduleGenerator:
             dining_moderate = int(dining_cfg.get("moderate", max(dining_target, 2)) or max(dining_target, 2))
 
             dining_count = self._max_concurrent(
-                assignments, day_index, lambda name: "server" in name and "cocktail" not in name and "patio" not in name
+                day_shifts, lambda name: "server" in name and "cocktail" not in name and "patio" not in name
             )
-            cocktail_count = self._max_concurrent(assignments, day_index, lambda name: "cocktail" in name)
-            cashier_count = self._max_concurrent(assignments, day_index, lambda name: "cashier" in name or "host" in name)
+            cocktail_count = self._max_concurrent(day_shifts, lambda name: "cocktail" in name)
+            cashier_count = self._max_concurrent(day_shifts, lambda name: "cashier" in name or "host" in name)
             # Dining checks
             if dining_count <= 0:
                 self.errors.append(f"Dining staffing missing on {day_label}.")
@@ -5278,14 +5681,11 @@ class ScheduleGenerator:
     def _record_required_role_gaps(self, assignments: List[Dict[str, Any]]) -> None:
         if not self.required_role_labels:
             return
-        for day_index in range(7):
+        for day_index, day_shifts in enumerate(self._shifts_by_day):
             for role_label in self.required_role_labels:
-                if any(
-                    role_matches(shift.get("role", ""), role_label) and self._day_index_for_shift(shift) == day_index
-                    for shift in assignments
-                ):
+                if any(role_matches(shift.get("role", ""), role_label) for shift in day_shifts):
                     continue
-                self.errors.append(f"Missing required role {role_label} on {self._day_label(day_index)}.")
+                self.errors.append(f"Missing required role {role_label} on {self._day_labels[day_index]}.")
 
     def _count_roles_for_day(
         self, assignments: List[Dict[str, Any]], day_index: int, predicate: Callable[[str], bool]
@@ -5301,13 +5701,11 @@ class ScheduleGenerator:
                 count += 1
         return count
 
-    def _max_concurrent(
-        self, assignments: List[Dict[str, Any]], day_index: int, predicate: Callable[[str], bool]
-    ) -> int:
+    @staticmethod
+    def _max_concurrent(day_shifts: List[Dict[str, Any]], predicate: Callable[[str], bool]) -> int:
+        """Peak overlap of one day's shifts (already bucketed by day) whose role matches ``predicate``."""
         events: List[Tuple[datetime.datetime, int]] = []
-        for shift in assignments:
-            if self._day_index_for_shift(shift) != day_index:
-                continue
+        for shift in day_shifts:
             start = shift.get("start")
             end = shift.get("end")
             role_name = (shift.get("role") or "").lower()
@@ -5321,7 +5719,7 @@ class ScheduleGenerator:
             events.append((end, -1))
         if not events:
             return 0
-        events.sort(key=lambda e: (e[0], e[1]))
+        events.sort()
         current = 0
         peak = 0
         for _ts, delta in events:
@@ -5329,8 +5727,22 @@ class ScheduleGenerator:
             peak = max(peak, current)
         return peak
 
+    def _bucket_shifts_by_day(self, assignments: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group an attempt's finished shifts by day so the end-of-attempt checks skip re-filtering."""
+        buckets: List[List[Dict[str, Any]]] = [[] for _ in range(7)]
+        for shift in assignments:
+            buckets[self._day_index_for_shift(shift)].append(shift)
+        return buckets
+
     def _day_index_for_shift(self, shift: Dict[str, Any]) -> int:
-        start_date = shift.get("start").date() if isinstance(shift.get("start"), datetime.datetime) else None
+        start_date = shift.get("_start_date")
+        if start_date is None:
+            start_date = shift.get("start").date() if isinstance(shift.get("start"), datetime.datetime) else None
+        if self._day_index_by_date:
+            day_index = self._day_index_by_date.get(start_date)
+            if day_index is not None:
+                return day_index
+            return start_date.weekday() if start_date else 0
         for ctx in self.day_contexts:
             if ctx.get("date") == start_date:
                 return ctx.get("day_index", start_date.weekday() if start_date else 0)
@@ -5358,7 +5770,8 @@ class ScheduleGenerator:
         end_time = override_end or demand.recommended_cut or demand.end
         if end_time <= start_time:
             end_time = demand.end
-        hours = max(0.0, (end_time - start_time).total_seconds() / 3600)
+        delta = (end_time - start_time).total_seconds()
+        hours = delta / 3600 if delta > 0 else 0.0
         cost = round(hours * rate, 2)
         notes = ", ".join(demand.labels)
         return {
@@ -5370,35 +5783,56 @@ class ScheduleGenerator:
             "labor_cost": cost,
             "location": demand.block_name,
             "notes": notes,
+            "_start_date": start_time.date(),
         }
 
-    def _build_summary(self, week: WeekSchedule, shifts: List[Dict[str, Any]]) -> Dict[str, Any]:
-        totals = []
-        total_cost = 0.0
-        total_shifts = 0
-        for day_offset in range(7):
-            date_value = week.week_start_date + datetime.timedelta(days=day_offset)
-            day_shifts = [shift for shift in shifts if shift["start"].date() == date_value]
-            day_cost = sum(shift["labor_cost"] for shift in day_shifts if shift["labor_cost"])
-            totals.append(
-                {
-                    "date": date_value.isoformat(),
-                    "shifts_created": len(day_shifts),
-                    "cost": round(day_cost, 2),
-                }
+    def _total_group_budget(self) -> float:
+        """Week-wide group budget, summed once per loaded budget set."""
+        if self._group_budget_total is None:
+            self._group_budget_total = sum(
+                (
+                    float(value)
+                    for day_budget in self.group_budget_by_day
+                    if isinstance(day_budget, dict)
+                    for value in day_budget.values()
+                ),
+                0.0,
             )
-            total_cost += day_cost
-            total_shifts += len(day_shifts)
-        total_budget = 0.0
-        if self.group_budget_by_day:
-            for day_budget in self.group_budget_by_day:
-                if not isinstance(day_budget, dict):
-                    continue
-                total_budget += sum(float(value) for value in day_budget.values())
-        budget_ratio = total_cost / total_budget if total_budget > 1e-6 else None
+        return self._group_budget_total
+
+    def _summary_columns(
+        self, week_start: datetime.date, shifts: List[Dict[str, Any]]
+    ) -> Tuple[array, array]:
+        """Split the final shifts into parallel day-offset and cost-in-cents columns (-1 marks out-of-week)."""
+        day_offsets = array("b")
+        cost_cents = array("q")
+        week_ordinal = week_start.toordinal()
+        for shift in shifts:
+            start_date = shift.get("_start_date")
+            if start_date is None and isinstance(shift.get("start"), datetime.datetime):
+                start_date = shift["start"].date()
+            day_offset = start_date.toordinal() - week_ordinal if start_date is not None else -1
+            day_offsets.append(day_offset if 0 <= day_offset < 7 else -1)
+            # Shift costs are already rounded to cents, so whole cents sum without float drift.
+            cost_cents.append(int(round((shift["labor_cost"] or 0) * 100)))
+        return day_offsets, cost_cents
+
+    def _build_summary(self, week: WeekSchedule, shifts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        week_start = week.week_start_date
+        day_offsets, cost_cents = self._summary_columns(week_start, shifts)
+        day_counts = [0] * 7
+        day_cents = [0] * 7
+        for day_offset, cents in zip(day_offsets, cost_cents):
+            if day_offset >= 0:
+                day_counts[day_offset] += 1
+                day_cents[day_offset] += cents
+        if self._week_dates and self._week_dates[0] == week_start:
+            week_dates_iso = self._week_dates_iso
+        else:
+            week_dates_iso = tuple((week_start + _TIMEDELTA(days=offset)).isoformat() for offset in range(7))
         employee_hours: Dict[str, float] = defaultdict(float)
         coverage_map: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        for shift in shifts:
+        for shift, day_offset in zip(shifts, day_offsets):
             emp_id = shift.get("employee_id")
             if emp_id is None:
                 continue
@@ -5406,15 +5840,34 @@ class ScheduleGenerator:
                 (shift["end"] - shift["start"]).total_seconds() / 3600 if shift.get("end") and shift.get("start") else 0
             )
             employee_hours[str(emp_id)] += round(duration, 2)
-            date_key = shift["start"].date().isoformat() if isinstance(shift.get("start"), datetime.datetime) else None
             section_label = (shift.get("_section") or role_group(shift.get("role")) or "other").lower()
-            if date_key:
-                coverage_map[date_key][section_label] += 1
+            if day_offset >= 0:
+                date_key = week_dates_iso[day_offset]
+            else:
+                start_date = shift.get("_start_date")
+                if start_date is None and isinstance(shift.get("start"), datetime.datetime):
+                    start_date = shift["start"].date()
+                if start_date is None:
+                    continue
+                date_key = start_date.isoformat()
+            coverage_map[date_key][section_label] += 1
+        totals = [
+            {
+                "date": date_key,
+                "shifts_created": day_counts[day_offset],
+                "cost": day_cents[day_offset] / 100,
+            }
+            for day_offset, date_key in enumerate(week_dates_iso)
+        ]
+        total_cost = sum(day_cents) / 100
+        total_shifts = sum(day_counts)
+        total_budget = self._total_group_budget()
+        budget_ratio = total_cost / total_budget if total_budget > 1e-6 else None
         coverage = [{"date": date_key, **sections} for date_key, sections in sorted(coverage_map.items())]
         return {
             "week_id": week.id,
             "days": totals,
-            "total_cost": round(total_cost, 2),
+            "total_cost": total_cost,
             "total_shifts": total_shifts,
             "projected_budget_total": round(total_budget, 2),
             "policy_budget_ratio": round(budget_ratio, 4) if budget_ratio is not None else None,
@@ -5423,13 +5876,3 @@ class ScheduleGenerator:
             "employee_hours_summary": dict(employee_hours),
             "section_coverage": coverage if coverage else list(self.section_coverage),
         }
-
-    @staticmethod
-    def _parse_projection_notes(raw: Optional[str]) -> Dict[str, Any]:
-        if not raw:
-            return {}
-        try:
-            parsed = json.loads(raw)
-            return parsed if isinstance(parsed, dict) else {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, Iterable, List, Set, Tuple
 
 
@@ -89,6 +90,7 @@ def is_manager_role(role: str) -> bool:
     return "mgr" in label or "MGR" in label
 
 
+@lru_cache(maxsize=None)
 def role_group(role: str) -> str:
     label = normalize_role(role)
     if not label:
@@ -164,6 +166,7 @@ def _normalized_variants(role: str) -> Set[str]:
     return variants
 
 
+@lru_cache(maxsize=None)
 def role_matches(candidate_role: str, target_role: str) -> bool:
     """Return True if a candidate role label should satisfy the requested role."""
     target_variants = _normalized_variants(target_role)
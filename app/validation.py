@@ -488,11 +488,18 @@ def _hoh_combo_issues(
     low_max = float(thresholds.get("low_max", 0.55) or 0.55)
     peak_min = float(thresholds.get("peak_min", 1.0) or 1.0)
     combo_roles = {normalize_role("HOH - Southwest & Grill"), normalize_role("HOH - Chip & Shake")}
+    combo_counts: Dict[int, int] = defaultdict(int)
+    station_counts: Dict[int, int] = defaultdict(int)
+    for shift in shifts:
+        role_key = normalize_role(shift.role)
+        day_index = _shift_day_index(shift)
+        if role_key in combo_roles:
+            combo_counts[day_index] += 1
+        if any(term in role_key for term in ["grill", "southwest", "chip", "shake"]):
+            station_counts[day_index] += 1
     for day_index in range(7):
         demand_index = demand_indices.get(day_index, 1.0)
-        combos_present = [
-            shift for shift in shifts if normalize_role(shift.role) in combo_roles and _shift_day_index(shift) == day_index
-        ]
+        combos_present = combo_counts[day_index] > 0
         if demand_index >= peak_min and combos_present:
             errors.append(
                 {
@@ -503,12 +510,7 @@ def _hoh_combo_issues(
                 }
             )
         if demand_index <= low_max and not combos_present:
-            bo_roles = [
-                shift
-                for shift in shifts
-                if _shift_day_index(shift) == day_index and any(term in normalize_role(shift.role) for term in ["grill", "southwest", "chip", "shake"])
-            ]
-            if len(bo_roles) >= 2:
+            if station_counts[day_index] >= 2:
                 warnings.append(
                     {
                         "type": "hoh_combo",
@@ -464,8 +464,123 @@ class ScheduleGeneratorTests(unittest.TestCase):
         self.assertFalse(after_violations)
         self.assertTrue(all(planned_end_times[i] <= planned_end_times[i + 1] for i in range(len(planned_end_times) - 1)))
 
+    def test_block_demand_is_slotted_with_cached_span(self) -> None:
+        start = datetime.datetime.combine(self.week_start, datetime.time(11, 0, tzinfo=datetime.timezone.utc))
+        demand = BlockDemand(
+            day_index=0,
+            date=self.week_start,
+            start=start,
+            end=start + datetime.timedelta(hours=5, minutes=30),
+            role="Server",
+            block_name="Mid",
+            labels=["Mid"],
+            need=1,
+        )
+        self.assertFalse(hasattr(demand, "__dict__"))
+        self.assertAlmostEqual(demand.duration_hours, 5.5)
+
+    def test_unavailability_edge_windows_match_interval_overlap(self) -> None:
+        self._add_employee(
+            "Edge Server",
+            ["Server"],
+            desired_hours=30,
+            unavailability=[
+                (0, "10:00", "09:00"),  # inverted
+                (1, "10:00", "10:00"),  # zero length
+                (3, "00:00", "01:00"),  # reached only by Wednesday's overnight demand
+                (4, "09:00", "12:00"),
+                (4, "11:00", "13:00"),
+            ],
+        )
+        generator = self._availability_generator()
+        record = generator._load_employee_profiles()[0]
+
+        self.assertEqual(record["unavailability_masks"][0], 0)
+        self.assertEqual(record["unavailability_masks"][1], 0)
+        self.assertFalse(generator._employee_available(record, self._demand(0, 8 * 60, 11 * 60)))
+        self.assertTrue(generator._employee_available(record, self._demand(0, 9 * 60, 10 * 60)))
+        self.assertTrue(generator._employee_available(record, self._demand(0, 12 * 60, 15 * 60)))
+        self.assertFalse(generator._employee_available(record, self._demand(1, 9 * 60, 11 * 60)))
+        self.assertTrue(generator._employee_available(record, self._demand(1, 10 * 60, 12 * 60)))
+        self.assertTrue(generator._employee_available(record, self._demand(1, 8 * 60, 10 * 60)))
+        self.assertFalse(generator._employee_available(record, self._demand(2, 20 * 60, 26 * 60)))
+        self.assertTrue(generator._employee_available(record, self._demand(2, 17 * 60, 23 * 60)))
+        self.assertTrue(generator._employee_available(record, self._demand(3, 60, 4 * 60)))
+        for day_index in range(7):
+            for start_minutes in range(0, 24 * 60, 30):
+                for length in range(30, 6 * 60 + 1, 30):
+                    demand = self._demand(day_index, start_minutes, start_minutes + length)
+                    self.assertEqual(
+                        generator._employee_available(record, demand),
+                        not self._brute_force_blocked(record, demand),
+                        (day_index, start_minutes, length),
+                    )
+
+    def test_overlapping_out_of_order_registrations_keep_overlap_test_exact(self) -> None:
+        self._add_employee("Busy Server", ["Server"], desired_hours=30)
+        generator = self._availability_generator()
+        record = generator._load_employee_profiles()[0]
+        # Forced and paired placements can overlap; register long-then-short and late-then-early.
+        placements = [(14 * 60, 16 * 60), (9 * 60, 18 * 60), (10 * 60, 11 * 60), (8 * 60, 9 * 60 + 30)]
+        for start_minutes, end_minutes in placements:
+            generator._register_assignment(record, self._demand(2, start_minutes, end_minutes))
+
+        self.assertEqual(list(record["day_starts"][2]), [480, 540, 600, 840])
+        self.assertEqual(list(record["day_end_max"][2]), [570, 1080, 1080, 1080])
+        for start_minutes in range(0, 24 * 60, 15):
+            for length in range(15, 4 * 60 + 1, 15):
+                demand = self._demand(2, start_minutes, start_minutes + length)
+                self.assertEqual(
+                    generator._employee_available(record, demand),
+                    not self._brute_force_blocked(record, demand),
+                    (start_minutes, length),
+                )
+
     # Helpers -----------------------------------------------------------------
 
+    def _availability_generator(self) -> ScheduleGenerator:
+        """Generator whose hour caps cannot reject a demand, leaving only the overlap tests."""
+        policy = self._policy(block_names=["Mid"])
+        policy["roles"]["Server"].pop("max_weekly_hours")
+        generator = ScheduleGenerator(self.session, policy, actor="tests", employee_session=self.employee_session)
+        generator.max_hours_per_day = 0
+        generator.max_hours_per_week = 1000.0
+        generator.desired_hours_ceiling_pct = 100.0
+        return generator
+
+    def _demand(self, day_index: int, start_minutes: int, end_minutes: int) -> BlockDemand:
+        day = self.week_start + datetime.timedelta(days=day_index)
+        midnight = datetime.datetime.combine(day, datetime.time(0, 0, tzinfo=datetime.timezone.utc))
+        return BlockDemand(
+            day_index=day_index,
+            date=day,
+            start=midnight + datetime.timedelta(minutes=start_minutes),
+            end=midnight + datetime.timedelta(minutes=end_minutes),
+            role="Server",
+            block_name="Mid",
+            labels=["Mid"],
+            need=1,
+            role_group="Servers",
+        )
+
+    @staticmethod
+    def _brute_force_blocked(record: dict, demand: BlockDemand) -> bool:
+        """Plain interval test over the raw windows and assignments the fast paths are built from."""
+        start_minutes, end_minutes = demand.window_minutes
+        for assigned_start, assigned_end in record["assignments"][demand.day_index]:
+            if assigned_start < end_minutes and assigned_end > start_minutes:
+                return True
+        cursor = start_minutes
+        while cursor < end_minutes:
+            offset = cursor // 1440
+            seg_start = cursor - offset * 1440
+            seg_end = min(end_minutes - offset * 1440, 1440)
+            for window_start, window_end in record["unavailability"].get((demand.day_index + offset) % 7, []):
+                if window_start < seg_end and window_end > seg_start:
+                    return True
+            cursor = (offset + 1) * 1440
+        return False
+
     def _run_generator(self, policy: dict) -> dict:
         engine = ScheduleGenerator(self.session, policy, actor="tests", employee_session=self.employee_session)
         return engine.generate(self.week_start)
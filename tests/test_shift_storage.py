@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import datetime
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from database import (  # noqa: E402
+    Base,
+    Shift,
+    bulk_upsert_shifts,
+    get_or_create_week,
+    upsert_shift,
+)
+import database as db  # noqa: E402
+
+UTC = datetime.timezone.utc
+
+
+class BulkUpsertShiftTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine, expire_on_commit=False, future=True)()
+        self.week = get_or_create_week(self.session, datetime.date(2024, 4, 1))
+        self.next_week = get_or_create_week(self.session, datetime.date(2024, 4, 8))
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+    def test_mixes_updates_and_inserts_and_returns_row_ids(self) -> None:
+        existing_id = upsert_shift(self.session, self._payload(self.week, 10, role="Server"))
+        ids = bulk_upsert_shifts(
+            self.session,
+            [
+                self._payload(self.week, 12),
+                {**self._payload(self.week, 9, role="Bartender"), "id": existing_id},
+                self._payload(self.next_week, 14),
+            ],
+        )
+
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(ids[1], existing_id)
+        rows = {row.id: row for row in self.session.scalars(select(Shift))}
+        self.assertEqual(set(rows), set(ids))
+        self.assertEqual(rows[ids[0]].start.hour, 12)
+        self.assertEqual(rows[ids[1]].role, "Bartender")
+        self.assertEqual(rows[ids[1]].start.hour, 9)
+        self.assertEqual(rows[ids[2]].week_id, self.next_week.id)
+
+    def test_bad_payload_leaves_nothing_committed(self) -> None:
+        existing_id = upsert_shift(self.session, self._payload(self.week, 10, role="Server"))
+        bad = self._payload(self.week, 15)
+        bad["end"] = bad["start"]
+        with self.assertRaises(ValueError):
+            bulk_upsert_shifts(
+                self.session,
+                [
+                    {**self._payload(self.week, 9, role="Bartender"), "id": existing_id},
+                    self._payload(self.week, 12),
+                    bad,
+                    self._payload(self.week, 16),
+                ],
+            )
+        self.session.rollback()
+
+        rows = list(self.session.scalars(select(Shift)))
+        self.assertEqual([row.id for row in rows], [existing_id])
+        self.assertEqual(rows[0].role, "Server")
+        self.assertEqual(rows[0].start.hour, 10)
+
+    def test_applies_week_status_once_per_week(self) -> None:
+        payloads = [self._payload(self.week, hour) for hour in (9, 11, 13)]
+        payloads += [self._payload(self.next_week, hour) for hour in (10, 12)]
+        with mock.patch.object(db, "_apply_week_status", wraps=db._apply_week_status) as apply_status:
+            bulk_upsert_shifts(self.session, payloads)
+
+        week_ids = [call.args[1].id for call in apply_status.call_args_list]
+        self.assertEqual(sorted(week_ids), sorted([self.week.id, self.next_week.id]))
+        statuses = {row.status for row in self.session.scalars(select(Shift))}
+        self.assertEqual(statuses, {"draft"})
+
+    @staticmethod
+    def _payload(week, hour: int, *, role: str = "Server - Dining") -> dict:
+        start = datetime.datetime.combine(week.week_start_date, datetime.time(hour, 0), tzinfo=UTC)
+        return {
+            "week_id": week.id,
+            "role": role,
+            "start": start,
+            "end": start + datetime.timedelta(hours=4),
+            "status": "draft",
+            "labor_rate": 10.0,
+        }
+
+
+if __name__ == "__main__":
+    unittest.main()